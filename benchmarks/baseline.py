@@ -0,0 +1,25 @@
+# Helpers shared by the benchmarks for writing results and comparing them
+# against a stored baseline.
+import json
+
+def flatten(results, prefix=''):
+    # Yields (dotted.name, value) for every numeric leaf
+    for key, value in results.items():
+        if isinstance(value, dict):
+            yield from flatten(value, f'{prefix}{key}.')
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield f'{prefix}{key}', value
+
+def compare(results, baseline_path, tolerance):
+    # Every metric is "lower is better"; returns the ones that regressed
+    with open(baseline_path) as f:
+        baseline = dict(flatten(json.load(f)))
+    regressions = [(name, baseline[name], value) for name, value in flatten(results)
+                   if name in baseline and value > baseline[name] * (1 + tolerance)]
+    for name, before, after in regressions:
+        print(f'REGRESSION {name}: {before:,.1f} -> {after:,.1f}')
+    return regressions
+
+def write(results, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
@@ -0,0 +1,43 @@
+# Time to bootstrap lift intervals: portfolio lift over products and
+# per-product lift over weekly facts (6 pre-campaign and 13 campaign weeks),
+# at each product count, with the resamples the pages use. Run from the
+# repository root:
+#   python benchmarks/bench_bootstrap.py --products 1000,5000,100000
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dashboard.bootstrap import portfolio_lift, product_lifts, resamples_for
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--products', default='1000,5000', help='comma-separated product counts')
+    parser.add_argument('--resamples', type=int, help='default: what the pages use at each product count')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f'{"products":>9}{"resamples":>11}{"portfolio":>12}{"per-product":>14}  portfolio lift')
+    for n in map(int, args.products.split(',')):
+        level = rng.uniform(100, 5_000, n)
+        effect = rng.normal(1.1, 0.15, n)
+        pre = rng.poisson(level[:, None], (n, 6))
+        campaign = rng.poisson((level * effect)[:, None], (n, 13))
+        labels = np.array([f'P{i}' for i in range(n)], dtype=object)
+
+        resamples = args.resamples or resamples_for(n)
+        portfolio, portfolio_s = timed(portfolio_lift, pre.mean(axis=1), campaign.mean(axis=1), resamples=resamples)
+        _, product_s = timed(product_lifts, pre, campaign, labels, resamples=resamples)
+        print(f'{n:>9,}{resamples:>11,}{portfolio_s * 1000:>9.0f} ms{product_s * 1000:>11.0f} ms  '
+              f'{portfolio.estimate:+.2%} [{portfolio.low:+.2%}, {portfolio.high:+.2%}]')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+# Microbenchmark: scalar human_format / human_currency vs the batch variants.
+# Run from the repository root: python benchmarks/bench_formatting.py
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dashboard.formatting import human_currency, human_currency_batch, human_format, human_format_batch
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    rng = np.random.default_rng(42)
+    for n in (10_000, 1_000_000):
+        # Magnitudes spread over all three suffix branches, with some NaNs
+        values = rng.normal(0, 10 ** rng.uniform(0, 8, n))
+        values[rng.random(n) < 0.01] = np.nan
+        repeat = 5 if n <= 10_000 else 1
+        for name, scalar, batch in [('human_format', human_format, human_format_batch),
+                                    ('human_currency', human_currency, human_currency_batch)]:
+            expected = [scalar(v) for v in values]
+            assert list(batch(values)) == expected, f'{name}: batch output differs from scalar'
+            t_scalar = best_of(lambda: [scalar(v) for v in values], repeat)
+            t_batch = best_of(lambda: batch(values), repeat)
+            print(f'{name:<15} n={n:>9,}  scalar {t_scalar * 1000:9.1f} ms  batch {t_batch * 1000:8.1f} ms  speedup {t_scalar / t_batch:5.1f}x')
+
+if __name__ == '__main__':
+    main()
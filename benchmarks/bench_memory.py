@@ -0,0 +1,102 @@
+# Memory report: the cached page tables as loaded (object product keys,
+# float64/int64 numbers) vs after compact_frame, and the bytes allocated to
+# build each page's chart frames the old way (copied, scaled columns with a
+# new 'Product' index) vs as chart_frame projections. Uses a synthetic
+# dataset. Run from the repository root:
+#   python benchmarks/bench_memory.py --products 100000
+import argparse
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.synthetic import write_dataset
+from dashboard.charts import chart_frame
+from dashboard.frames import compact_frame
+from dashboard.store import DATA_STORE_PATH, DataStore
+from dashboard.workbooks import load_columnar, read_prior_periods_excel, read_yoy_excel
+
+MIB = 1024 ** 2
+
+# table -> [(chart series -> source column, percent scaled)]
+CHARTS = {
+    'YOY Analysis': [({'Increase (%)': 'Increase in sales from Prior Year AVE'}, True),
+                     ({'Prior Year': 'QTY Sold Prior Year', 'Campaign Period': 'QTY Sold CAMPAIGN PERIOD'}, False)],
+    'Category Analysis': [({'PepsiCo': 'PepsiCo Campaign Category Share', 'Competitors': 'Competitor Category Share'}, True),
+                          ({'Pre-Campaign PepsiCo Share (%)': 'Pre-Campaign PepsiCo'}, True),
+                          ({'PepsiCo (Campaign)': 'PepsiCo Campaign Category Share', 'PepsiCo (Pre-Campaign)': 'Pre-Campaign PepsiCo',
+                            'Competitor (Campaign)': 'Competitor Category Share'}, True)],
+    'Campaign Units Analysis': [({'Pre-Campaign': 'pre', 'Campaign': 'campaign', 'Post-Campaign': 'post'}, False),
+                                ({'% Change (Campaign vs Pre)': '% Change (Campaign vs Pre)'}, True),
+                                ({'% Change (Campaign vs Post)': '% Change (Campaign vs Post)'}, True)],
+}
+
+def copied_chart(df, series, scaled):
+    # How pages built chart frames before: copied columns, scaled up front
+    columns = {'Product': df['Product Description']}
+    columns.update({name: df[column] * 100 if scaled else df[column] for name, column in series.items()})
+    return pd.DataFrame(columns).set_index('Product')
+
+def allocated(build):
+    tracemalloc.start()
+    try:
+        frame = build()
+        return tracemalloc.get_traced_memory()[0], frame
+    finally:
+        tracemalloc.stop()
+
+def table_bytes(df):
+    return int(df.memory_usage(deep=True).sum())
+
+def expanded(df):
+    # A store result as read_sql_query returns it, before compact_frame
+    return df.astype({name: 'int64' if dtype.kind == 'i' else 'float64' if dtype.kind == 'f' else object
+                      for name, dtype in df.dtypes.items()})
+
+def load_tables(directory):
+    store = DataStore(os.path.join(directory, DATA_STORE_PATH), seed=False)
+    try:
+        campaign_id = store.campaigns()[0].campaign_id
+        return {
+            'YOY Analysis': load_columnar(os.path.join(directory, 'YOY Analysis.xlsx'), read_yoy_excel),
+            'Prior Periods': load_columnar(os.path.join(directory, 'Prior Periods.xlsx'), read_prior_periods_excel),
+            'Category Analysis': expanded(store.category_shares()),
+            'Campaign Units Analysis': expanded(store.campaign_periods('units', campaign_id)),
+        }
+    finally:
+        store.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--products', type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f'Generating {args.products:,} synthetic products...')
+        write_dataset(directory, args.products)
+        tables = load_tables(directory)
+
+    print(f'\n{"table":<26}{"loaded MiB":>12}{"compact MiB":>13}{"saved":>8}')
+    totals = [0, 0]
+    compacted = {}
+    for name, df in tables.items():
+        compacted[name] = compact_frame(df)
+        before, after = table_bytes(df), table_bytes(compacted[name])
+        totals[0] += before
+        totals[1] += after
+        print(f'{name:<26}{before / MIB:>12.1f}{after / MIB:>13.1f}{1 - after / before:>8.0%}')
+    print(f'{"total":<26}{totals[0] / MIB:>12.1f}{totals[1] / MIB:>13.1f}{1 - totals[1] / totals[0]:>8.0%}')
+
+    print(f'\n{"chart frames":<26}{"copied MiB":>12}{"view MiB":>13}{"saved":>8}')
+    for name, charts in CHARTS.items():
+        copied = view = 0
+        for series, scaled in charts:
+            copied += allocated(lambda: copied_chart(tables[name], series, scaled))[0]
+            view += allocated(lambda: chart_frame(compacted[name], series))[0]
+        print(f'{name:<26}{copied / MIB:>12.1f}{view / MIB:>13.1f}{1 - view / copied:>8.0%}')
+
+if __name__ == '__main__':
+    main()
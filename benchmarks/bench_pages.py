@@ -0,0 +1,99 @@
+# Scale benchmark for every report page. Generates synthetic workbooks and a
+# synthetic data store at each product count, then drives each page
+# headlessly through Streamlit's AppTest in its own process, recording wall
+# time and bytes sent for a cold run (no sidecar, empty caches) and a warm
+# rerun, plus peak RSS. Run from the repository root:
+#
+#   python benchmarks/bench_pages.py --output pages.json
+#   python benchmarks/bench_pages.py --scales 10,1000 --baseline pages.json
+#
+# With --baseline the script exits non-zero when any metric regresses by
+# more than the tolerance.
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from benchmarks.baseline import compare, write
+from benchmarks.synthetic import write_dataset
+from yoy_analysis_app import PAGES
+
+SCALES = (10, 1_000, 100_000, 1_000_000)
+
+PAGE_SCRIPT = '''
+import json, resource, sys, time
+sys.path.insert(0, sys.argv[1])
+from streamlit.testing.v1 import AppTest
+
+def delta_bytes(node):
+    # Serialized size of every element the run produced
+    size = node.proto.ByteSize() if getattr(node, "proto", None) is not None else 0
+    return size + sum(delta_bytes(child) for child in getattr(node, "children", {}).values())
+
+module, func = sys.argv[2].split(":")
+at = AppTest.from_string(f"import sys\\nsys.path.insert(0, {sys.argv[1]!r})\\nfrom {module} import {func}\\n{func}()\\n", default_timeout=3600)
+result = {}
+for run in ("cold", "warm"):
+    start = time.perf_counter()
+    at.run()
+    result[run] = {"wall_ms": (time.perf_counter() - start) * 1000, "delta_bytes": delta_bytes(at._tree)}
+    if at.exception:
+        result[run]["exception"] = at.exception[0].message
+result["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps(result))
+'''
+
+def dataset_dir(data_dir, n):
+    directory = os.path.join(data_dir, f'products-{n}')
+    marker = os.path.join(directory, '.complete')
+    if not os.path.exists(marker):
+        start = time.perf_counter()
+        write_dataset(directory, n)
+        open(marker, 'w').close()
+        print(f'generated {n:,} products in {time.perf_counter() - start:.1f}s', flush=True)
+    return directory
+
+def run_page(directory, spec):
+    # Cold run starts without sidecars so ingestion cost is included
+    for sidecar in glob.glob(os.path.join(directory, '*.parquet')):
+        os.remove(sidecar)
+    proc = subprocess.run([sys.executable, '-c', PAGE_SCRIPT, ROOT, spec],
+                          cwd=directory, capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-page benchmark at synthetic scale')
+    parser.add_argument('--scales', default=','.join(map(str, SCALES)), help='comma-separated product counts')
+    parser.add_argument('--pages', default=','.join(PAGES), help='comma-separated report names')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'dashboard-bench'),
+                        help='where synthetic datasets are generated and reused')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--baseline', help='compare against a previous --output file')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed fractional regression vs baseline')
+    args = parser.parse_args()
+
+    results = {}
+    for n in (int(s) for s in args.scales.split(',')):
+        directory = dataset_dir(args.data_dir, n)
+        for page in args.pages.split(','):
+            result = run_page(directory, PAGES[page])
+            results.setdefault(str(n), {})[page] = result
+            for run in ('cold', 'warm'):
+                r = result[run]
+                print(f"{n:>9,} {page:<32} {run:<5} {r['wall_ms']:10.1f} ms {r['delta_bytes']:>12,} B"
+                      + (f"  EXCEPTION: {r['exception']}" if 'exception' in r else ''), flush=True)
+            print(f"{n:>9,} {page:<32} peak RSS {result['peak_rss_mb']:.0f} MB", flush=True)
+
+    if args.output:
+        write(results, args.output)
+    if args.baseline and compare(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
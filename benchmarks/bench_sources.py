@@ -0,0 +1,58 @@
+# Load times for the YOY and Prior Periods tables from the workbooks (openpyxl
+# parse, then the Parquet sidecar) and from a SQLite copy through the SQL data
+# source, and whether the YOY Key Findings agree. Uses a synthetic dataset.
+# Run from the repository root:
+#   python benchmarks/bench_sources.py --products 100000
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.synthetic import write_dataset
+from dashboard.sources import PRIOR_PERIODS_WORKBOOK, YOY_WORKBOOK, SqlSource, workbooks_to_sqlite
+from dashboard.workbooks import (WorkbookCache, load_columnar, read_prior_periods_excel, read_yoy_excel,
+                                 summarize_yoy_workbook)
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--products', type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f'Generating {args.products:,} synthetic products...')
+        write_dataset(directory, args.products)
+        db = os.path.join(directory, 'sales.db')
+        workbooks_to_sqlite(db, directory)
+        yoy, prior = os.path.join(directory, YOY_WORKBOOK), os.path.join(directory, PRIOR_PERIODS_WORKBOOK)
+
+        rows = []
+        for label in ('xlsx', 'parquet'):
+            # The first pass parses the workbooks and writes the sidecars the second reads
+            file_summary, summary_s = timed(summarize_yoy_workbook, yoy)
+            _, yoy_s = timed(load_columnar, yoy, read_yoy_excel)
+            _, prior_s = timed(load_columnar, prior, read_prior_periods_excel)
+            rows.append((label, yoy_s, prior_s, summary_s))
+
+        source = SqlSource(f'sqlite:///{db}', WorkbookCache(), ttl=0)
+        _, yoy_s = timed(source.yoy_table)
+        _, prior_s = timed(source.prior_periods_frame)
+        sql_summary, summary_s = timed(source.yoy_summary)
+        rows.append(('sqlite', yoy_s, prior_s, summary_s))
+        source.pool.close()
+
+    print(f'\n{"source":<10}{"YOY table":>12}{"Prior Periods":>15}{"YOY findings":>14}')
+    for label, *seconds in rows:
+        print(f'{label:<10}' + ''.join(f'{s * 1000:>{w}.0f} ms' for s, w in zip(seconds, (9, 12, 11))))
+    same = (file_summary.increase_count, file_summary.decrease_count, file_summary.top_grower, file_summary.top_decliner) == \
+           (sql_summary.increase_count, sql_summary.decrease_count, sql_summary.top_grower, sql_summary.top_decliner)
+    print(f'\nYOY findings match: {same}')
+
+if __name__ == '__main__':
+    main()
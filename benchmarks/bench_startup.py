@@ -0,0 +1,81 @@
+# Cold-start benchmark: `python -X importtime` totals for the app and each
+# report module, plus time-to-first-render measured with Streamlit's AppTest
+# in a fresh process. Run from the repository root:
+#
+#   python benchmarks/bench_startup.py --output startup.json
+#   python benchmarks/bench_startup.py --baseline startup.json --tolerance 0.25
+#
+# With --baseline the script exits non-zero when any timing regresses by
+# more than the tolerance.
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from benchmarks.baseline import compare, flatten, write
+from yoy_analysis_app import PAGES
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+FIRST_RENDER_SCRIPT = '''
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=600)
+start = time.perf_counter()
+at.run()
+result = {"first_render_ms": (time.perf_counter() - start) * 1000, "first_visit_ms": {}}
+for page in json.loads(sys.argv[2]):
+    start = time.perf_counter()
+    at.sidebar.radio[0].set_value(page).run()
+    result["first_visit_ms"][page] = (time.perf_counter() - start) * 1000
+print(json.dumps(result))
+'''
+
+def import_time(module):
+    # Sum of self times over every module imported by `import <module>`
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    total_us = 0
+    modules = set()
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            total_us += int(match.group(1))
+            modules.add(match.group(4))
+    return {'total_ms': total_us / 1000, 'modules': len(modules),
+            'loads_pandas': 'pandas' in modules, 'loads_openpyxl': 'openpyxl' in modules}
+
+def first_render():
+    pages = [p for p in PAGES if p != next(iter(PAGES))]
+    proc = subprocess.run([sys.executable, '-c', FIRST_RENDER_SCRIPT, os.path.join(ROOT, 'yoy_analysis_app.py'), json.dumps(pages)],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold-start import and first-render benchmark')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--baseline', help='compare against a previous --output file')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed fractional slowdown vs baseline')
+    args = parser.parse_args()
+
+    results = {'import': {'app': import_time('yoy_analysis_app')}, 'render': first_render()}
+    for spec in PAGES.values():
+        module = spec.split(':')[0]
+        results['import'][module] = import_time(module)
+
+    for name, value in flatten(results):
+        print(f'{name:<70} {value:10.1f}')
+    app = results['import']['app']
+    print(f"app entry point imports pandas: {app['loads_pandas']}, openpyxl: {app['loads_openpyxl']}")
+
+    if args.output:
+        write(results, args.output)
+    if args.baseline and compare(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+# Throughput of the streaming shopper-transaction aggregation behind the
+# Demographics page, for Parquet and CSV inputs, with the peak RSS of a fresh
+# process doing only the aggregation. Run from the
+# repository root:
+#   python benchmarks/bench_transactions.py --rows 10000000
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.synthetic import write_transactions
+from dashboard.shoppers import summarize_transactions
+
+def aggregate(path):
+    start = time.perf_counter()
+    splits = summarize_transactions(path)
+    elapsed = time.perf_counter() - start
+    return splits, elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--formats', default='parquet,csv')
+    args = parser.parse_args()
+
+    spawn = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as directory:
+        for fmt in args.formats.split(','):
+            path = os.path.join(directory, f'Shopper Transactions.{fmt}')
+            write_transactions(path, args.rows, np.random.default_rng(0))
+            size = os.path.getsize(path) / 1024 ** 2
+            with spawn.Pool(1) as pool:
+                splits, elapsed, peak = pool.apply(aggregate, (path,))
+            print(f'{fmt:<8} {splits.records:>12,} rows  {size:8.0f} MiB  {elapsed:6.2f} s  '
+                  f'{splits.records / elapsed / 1e6:6.1f} M rows/s  peak RSS {peak:,.0f} MiB')
+            print(f'         top day {splits.day.idxmax()} {splits.day.max():.1%}, '
+                  f'female {splits.gender["Female"]:.1%}, top age {splits.age.idxmax()} {splits.age.max():.1%}')
+
+if __name__ == '__main__':
+    main()
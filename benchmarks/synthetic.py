@@ -0,0 +1,108 @@
+# Synthetic inputs shaped like the real ones, at any number of products:
+# the two workbooks plus a data store with share, sales and demographic facts,
+# and raw shopper transactions at any number of rows.
+import os
+import sys
+
+import numpy as np
+import openpyxl
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dashboard.store import DATA_STORE_PATH, SEED_CAMPAIGN, SEED_DEMOGRAPHIC_FACTS, DataStore
+
+def product_names(n):
+    return [f'SYNTHETIC PRODUCT {i:07d}' for i in range(n)]
+
+def _write_workbook(path, title, header, columns):
+    # write_only keeps openpyxl from building cell objects for the whole sheet
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append([title])
+    ws.append(header)
+    for row in zip(*columns):
+        ws.append(row)
+    # Totals row without a product, like the real workbooks
+    ws.append([None] + [float(np.nansum(c)) for c in columns[1:]])
+    wb.save(path)
+
+def write_yoy_workbook(path, n, rng):
+    prior = rng.integers(1_000, 300_000, n)
+    campaign = np.maximum(prior * rng.normal(1.15, 0.3, n), 0).astype(np.int64)
+    change = (campaign - prior) / prior
+    _write_workbook(path, 'YEAR ON YEAR ANALYSIS',
+                    ['Product Description', 'QTY Sold Prior Year\n14 May 2024 to 14 Aug 2024',
+                     'QTY Sold CAMPAIGN PERIOD\n14 May 2025 to 14 Aug 2025', 'Increase in sales from Prior Year AVE'],
+                    [product_names(n), prior.tolist(), campaign.tolist(), change.tolist()])
+
+def write_prior_periods_workbook(path, n, rng):
+    prior_year = rng.integers(1_000, 300_000, n)
+    feb_may = np.maximum(prior_year * rng.normal(1.1, 0.2, n), 0).astype(np.int64)
+    campaign = np.maximum(feb_may * rng.normal(1.05, 0.2, n), 0).astype(np.int64)
+    increase = campaign / ((prior_year + feb_may) / 2) - 1
+    _write_workbook(path, 'Product Unit Sales and Prior Period Totals',
+                    ['Product Description', 'QTY Sold Prior Year\n14 May to 14 Aug 2024', 'QTY Sold  14 Feb to 13 May 2025',
+                     'QTY Sold (CAMPAIGN PERIOD)\n14 May to 14 Aug 2025', 'Increase in sales from Avg of prior months'],
+                    [product_names(n), prior_year.tolist(), feb_may.tolist(), campaign.tolist(), increase.tolist()])
+
+def _split(rng, n, k):
+    # Random percentage splits over k buckets that sum to ~100 per product
+    return np.round(rng.dirichlet(np.ones(k) * 5, n) * 100).astype(np.int64).T.tolist()
+
+def write_data_store(path, n, rng):
+    products = product_names(n)
+    store = DataStore(path, seed=False)
+    store.add_products(products)
+    pepsico = rng.uniform(0.05, 0.9, n)
+    pre_pepsico = np.clip(pepsico + rng.normal(0, 0.03, n), 0.01, 1)
+    store.add_facts('share_facts', 'campaign', {'pepsico_share': pepsico.tolist(), 'competitor_share': (1 - pepsico).tolist()}, products)
+    store.add_facts('share_facts', 'pre_campaign', {'pepsico_share': pre_pepsico.tolist(), 'share_change': (pepsico / pre_pepsico - 1).tolist()}, products)
+
+    campaign_id = store.add_campaign(*SEED_CAMPAIGN, build=False)
+    units = {p: rng.integers(500, 150_000, n) for p in ('pre', 'campaign', 'post')}
+    price = rng.uniform(10, 120, n)
+    for period, period_units in units.items():
+        facts = {'units': period_units.tolist(), 'sales': (period_units * price).round(2).tolist()}
+        if period != 'campaign':
+            change = units['campaign'] / period_units - 1 if period == 'pre' else period_units / units['campaign'] - 1
+            facts.update(campaign_vs_units=change.tolist(), campaign_vs_sales=change.tolist())
+        store.add_facts('sales_facts', period, facts, products, campaign_id=campaign_id)
+
+    for dimension, buckets in SEED_DEMOGRAPHIC_FACTS.items():
+        store.add_demographics(dimension, dict(zip(buckets, _split(rng, n, len(buckets)))), products)
+    store.close()
+
+def write_transactions(path, rows, rng, products=1_000, chunk_rows=1_000_000):
+    # Shopper records over the campaign window, as Parquet or CSV by extension
+    import pyarrow as pa
+    import pyarrow.csv as pv
+    import pyarrow.parquet as pq
+
+    start = np.datetime64('2025-05-14T00:00:00', 's')
+    span_s = int((np.datetime64('2025-08-15T00:00:00', 's') - start).astype(np.int64))
+    names = np.array(product_names(products))
+    writer = None
+    try:
+        for offset in range(0, rows, chunk_rows):
+            n = min(chunk_rows, rows - offset)
+            table = pa.table({
+                'timestamp': start + rng.integers(0, span_s, n).astype('timedelta64[s]'),
+                'gender': np.where(rng.random(n) < 0.56, 'Female', 'Male'),
+                'age': np.clip(rng.normal(38, 14, n), 16, 90).round(),
+                'product': names[rng.integers(0, products, n)],
+                'quantity': rng.integers(1, 6, n),
+            })
+            if writer is None:
+                writer = (pq.ParquetWriter(path, table.schema) if path.endswith('.parquet')
+                          else pv.CSVWriter(path, table.schema))
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+def write_dataset(directory, n, seed=0):
+    # Lays out a working directory the app can be run from
+    os.makedirs(directory, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    write_yoy_workbook(os.path.join(directory, 'YOY Analysis.xlsx'), n, rng)
+    write_prior_periods_workbook(os.path.join(directory, 'Prior Periods.xlsx'), n, rng)
+    write_data_store(os.path.join(directory, DATA_STORE_PATH), n, rng)
@@ -0,0 +1,138 @@
+import os
+from collections import namedtuple
+
+import streamlit as st
+import numpy as np
+import pandas as pd
+
+from dashboard.cache import get_shared_cache
+from dashboard.diagnostics import span
+from dashboard.fragments import fragment
+
+# ---------------- Bootstrap Intervals ----------------
+# Percentile confidence intervals for campaign lift (current / baseline - 1).
+# Portfolio lift is the ratio of totals over products and is bootstrapped by
+# resampling products; per-product lift is the ratio of weekly means and is
+# bootstrapped by resampling weeks within each period. Either way a single
+# resampling matrix is drawn for all products at once and reduced with array
+# operations, in blocks of about BLOCK_CELLS cells so memory stays bounded.
+# Resamples come from a fixed seed, so an interval only moves with its data.
+# Very large portfolios get fewer resamples (down to MIN_RESAMPLES) so that
+# products x resamples stays within MAX_CELLS.
+RESAMPLES = int(os.environ.get('DASHBOARD_BOOTSTRAP_RESAMPLES', 10_000))
+MIN_RESAMPLES = 1_000
+MAX_CELLS = 100_000_000
+CONFIDENCE = 0.95
+BLOCK_CELLS = 4 * 1024 ** 2
+SEED = 0
+
+Interval = namedtuple('Interval', 'estimate low high resamples')
+
+def resamples_for(n):
+    return min(RESAMPLES, max(MIN_RESAMPLES, MAX_CELLS // max(n, 1)))
+
+def _ranks(resamples, confidence):
+    # Order statistics bounding the central confidence share of the resamples
+    alpha = (1 - confidence) / 2
+    return [int(np.floor(alpha * (resamples - 1))), int(np.ceil((1 - alpha) * (resamples - 1)))]
+
+def portfolio_lift(baseline, current, resamples=None, confidence=CONFIDENCE, seed=SEED):
+    # sum(current) / sum(baseline) - 1 over products with both values
+    baseline = np.asarray(baseline, dtype=np.float64)
+    current = np.asarray(current, dtype=np.float64)
+    valid = ~(np.isnan(baseline) | np.isnan(current))
+    baseline, current = baseline[valid], current[valid]
+    n = len(baseline)
+    if n == 0 or baseline.sum() == 0:
+        return Interval(np.nan, np.nan, np.nan, 0)
+
+    resamples = resamples or resamples_for(n)
+    rng = np.random.default_rng(seed)
+    lifts = np.empty(resamples)
+    block = max(1, BLOCK_CELLS // n)
+    # Gathers dominate; single precision halves the bytes they move
+    base32, current32 = baseline.astype(np.float32), current.astype(np.float32)
+    with span('compute'), np.errstate(divide='ignore', invalid='ignore'):
+        for start in range(0, resamples, block):
+            # Row r holds the product positions drawn for resample r, shared by both sums
+            rows = rng.integers(0, n, (min(block, resamples - start), n), dtype=np.int32)
+            lifts[start:start + len(rows)] = np.take(current32, rows).sum(axis=1) / np.take(base32, rows).sum(axis=1) - 1
+        ranks = _ranks(resamples, confidence)
+        low, high = np.partition(lifts, ranks)[ranks]
+    return Interval(current.sum() / baseline.sum() - 1, low, high, resamples)
+
+def _week_weights(rng, weeks, resamples):
+    # (weeks x resamples): draw counts per week, scaled so each column averages
+    counts = rng.multinomial(weeks, np.full(weeks, 1 / weeks), size=resamples)
+    return (counts.T / weeks).astype(np.float32)
+
+def product_lifts(baseline, current, labels, resamples=None, confidence=CONFIDENCE, seed=SEED):
+    # baseline, current: (products x weeks) weekly values, missing weeks as 0.
+    # Returns estimate / low / high per product label.
+    baseline = np.asarray(baseline, dtype=np.float32)
+    current = np.asarray(current, dtype=np.float32)
+    resamples = resamples or resamples_for(len(labels))
+    rng = np.random.default_rng(seed)
+    base_weights = _week_weights(rng, baseline.shape[1], resamples)
+    current_weights = _week_weights(rng, current.shape[1], resamples)
+    ranks = _ranks(resamples, confidence)
+    bounds = np.empty((len(labels), 2))
+    block = max(1, BLOCK_CELLS // resamples)
+    with span('compute'), np.errstate(divide='ignore', invalid='ignore'):
+        estimate = current.mean(axis=1, dtype=np.float64) / baseline.mean(axis=1, dtype=np.float64) - 1
+        for start in range(0, len(labels), block):
+            # (block x resamples) resampled weekly means, as ratios
+            lift = current[start:start + block] @ current_weights
+            lift /= baseline[start:start + block] @ base_weights
+            bounds[start:start + block] = np.partition(lift, ranks, axis=1)[:, ranks] - 1
+    return pd.DataFrame({'estimate': estimate, 'low': bounds[:, 0], 'high': bounds[:, 1]},
+                        index=pd.Index(labels, name='Product'))
+
+def weekly_matrix(weekly, period, labels):
+    # One period of store.weekly_periods as (len(labels) x weeks), zero-filled
+    rows = weekly[weekly['period'] == period]
+    if rows.empty:
+        return None
+    matrix = rows.pivot_table(index='Product Description', columns='week_start', values='value',
+                              aggfunc='sum', observed=True)
+    matrix = matrix.set_axis(matrix.index.astype(object)).reindex(pd.Index(labels, dtype=object)).fillna(0)
+    # Row means must match the rollup's SUM / weeks: weeks without any sales
+    # are added as zeros, and a window spanning more week starts than its
+    # length in weeks is scaled down
+    weeks, values = int(rows['weeks'].iloc[0]), matrix.to_numpy(dtype=np.float64)
+    if values.shape[1] < weeks:
+        return np.pad(values, ((0, 0), (0, weeks - values.shape[1])))
+    return values * (values.shape[1] / weeks)
+
+# ---------------- Lift Captions ----------------
+def _interval_text(interval):
+    return f"{interval.estimate:+.1%} ({CONFIDENCE:.0%} CI {interval.low:+.1%} to {interval.high:+.1%})"
+
+@fragment
+def lift_intervals(df, name, baseline, current, label, weekly=None, periods=None):
+    # Caption under a chart: portfolio lift of df[current] over df[baseline] and,
+    # given the weekly facts df was rolled up from and their (baseline, current)
+    # periods, per-product intervals. Computed once per dataset version and
+    # shared like the chart frames.
+    cache = get_shared_cache()
+    portfolio = cache.derived(df, ('portfolio lift', name),
+                              lambda df: portfolio_lift(df[baseline].to_numpy(), df[current].to_numpy()))
+    if np.isnan(portfolio.estimate):
+        return
+    st.caption(f"{label}: {_interval_text(portfolio)} over {portfolio.resamples:,} product resamples.")
+    if weekly is None or weekly.empty:
+        return
+
+    def build(weekly):
+        labels = df['Product Description'].astype(object).to_numpy()
+        matrices = [weekly_matrix(weekly, period, labels) for period in periods]
+        return None if any(m is None for m in matrices) else product_lifts(*matrices, labels)
+    products = cache.derived(weekly, ('product lifts', name), build)
+    if products is None:
+        return
+    rose, fell = int((products['low'] > 0).sum()), int((products['high'] < 0).sum())
+    st.caption(f"Per-product {CONFIDENCE:.0%} CIs over {resamples_for(len(products)):,} week resamples: "
+               f"{rose} products rose and {fell} fell with intervals excluding zero.")
+    with st.expander("Per-product lift intervals"):
+        st.dataframe(products.sort_values('estimate', ascending=False) * 100, column_config={
+            c: st.column_config.NumberColumn(c.capitalize(), format="%+.1f%%") for c in products.columns})
@@ -0,0 +1,130 @@
+import os
+import sys
+import threading
+import weakref
+from collections import OrderedDict, deque
+
+import streamlit as st
+
+# ---------------- Shared Cache ----------------
+# One process-wide LRU for prepared datasets, query results and chart frames,
+# shared read-only by every session. Each entry is sized when it is stored and
+# the least recently used entries are evicted once the byte budget is
+# exceeded, so resident memory follows the data rather than the number of
+# connected viewers. DASHBOARD_CACHE_BYTES sets the budget.
+CACHE_BUDGET_BYTES = int(os.environ.get('DASHBOARD_CACHE_BYTES', 512 * 1024 ** 2))
+
+def entry_size(value):
+    # Bytes held by a cached value; object columns are counted deep
+    if hasattr(value, 'memory_usage'):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(entry_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(entry_size(v) for v in value)
+    return sys.getsizeof(value)
+
+class SharedCache:
+    def __init__(self, budget=CACHE_BUDGET_BYTES):
+        self.budget = budget
+        self.resident = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Keys of derived entries whose source was garbage collected
+        self._dead = deque()
+
+    def lookup(self, key):
+        # (True, value) on a hit, (False, None) on a miss
+        with self._lock:
+            self._reap()
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key][0]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value, size=None):
+        size = entry_size(value) if size is None else size
+        with self._lock:
+            self._reap()
+            self._pop(key)
+            if size > self.budget:
+                # Larger than the whole budget: serve it uncached
+                return value
+            self._entries[key] = (value, size)
+            self.resident += size
+            while self.resident > self.budget:
+                self._pop(next(iter(self._entries)))
+                self.evictions += 1
+        return value
+
+    def resize(self, key, size):
+        # Re-size an entry whose value grew or shrank in place; absent keys stay absent
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            self.resident += size - entry[1]
+            self._entries[key] = (entry[0], size)
+            if size > self.budget:
+                self._pop(key)
+            while self.resident > self.budget:
+                self._pop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def discard(self, predicate):
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                self._pop(key)
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries)
+
+    def _pop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.resident -= entry[1]
+
+    def _reap(self):
+        while self._dead:
+            self._pop(self._dead.popleft())
+
+    def derived(self, source, name, build):
+        # build(source), cached while source itself stays alive; source is one of
+        # the shared frames above, so every session gets the same derived object
+        key = ('derived', name, id(source))
+        found, entry = self.lookup(key)
+        if found and entry[0]() is source:
+            return entry[1]
+        value = build(source)
+        ref = weakref.ref(source, lambda _, key=key: self._dead.append(key))
+        self.put(key, (ref, value), entry_size(value))
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'resident_bytes': self.resident, 'budget_bytes': self.budget,
+                    'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.resident = 0
+
+@st.cache_resource
+def get_shared_cache():
+    return SharedCache()
+
+def render_cache_stats():
+    stats = get_shared_cache().stats()
+    st.markdown(f"**Shared cache:** {stats['resident_bytes'] / 1024 ** 2:,.1f} / {stats['budget_bytes'] / 1024 ** 2:,.0f} MiB "
+                f"in {stats['entries']} entries")
+    st.caption(f"{stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions")
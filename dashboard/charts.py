@@ -0,0 +1,157 @@
+import re
+from contextlib import contextmanager
+
+import streamlit as st
+import numpy as np
+import pandas as pd
+
+from dashboard.cache import get_shared_cache
+from dashboard.diagnostics import span
+from dashboard.fragments import fragment
+
+# ---------------- Chart Preparation ----------------
+# Per-product charts are reduced on the server before st.bar_chart, so the
+# payload and render time stay bounded however many products a page has.
+MAX_CHART_BARS = 40
+
+def _top_positions(values, n):
+    # Positions of the n largest values, largest first; NaNs rank last
+    filled = np.where(np.isnan(values), -np.inf, values)
+    n = min(n, len(filled))
+    if n <= 0:
+        return np.empty(0, dtype=np.int64)
+    part = np.argpartition(-filled, n - 1)[:n]
+    return part[np.argsort(-filled[part], kind='stable')]
+
+def prepare_chart_data(data, sort_by=None, keep='top', max_bars=MAX_CHART_BARS, other='sum', rollup=None):
+    # data: chart frame indexed by label. keep is 'top', 'bottom' or 'extremes'
+    # (both ends, for % change charts); rows that don't fit are folded into an
+    # "Other" bar using the other aggregation ('sum', 'mean', or None to drop).
+    # Per-product volume charts use 'mean': summed over thousands of products
+    # the bucket dwarfs every kept bar.
+    # rollup maps labels to groups (e.g. product -> category) before ranking.
+    if rollup is not None:
+        name = data.index.name
+        data = data.groupby(data.index.map(rollup), sort=False).agg(other or 'sum')
+        data.index.name = name
+    if max_bars is None or len(data) <= max_bars:
+        return data
+
+    n = max_bars - 1 if other else max_bars
+    values = data[sort_by or data.columns[0]].to_numpy(dtype=np.float64)
+    if keep == 'top':
+        kept = _top_positions(values, n)
+    elif keep == 'bottom':
+        kept = _top_positions(-values, n)
+    elif keep == 'extremes':
+        top = _top_positions(values, n - n // 2)
+        bottom = _top_positions(-values, n // 2)
+        # Growers first, then decliners ending with the largest decline
+        kept = np.concatenate([top, bottom[~np.isin(bottom, top)][::-1]])
+    else:
+        raise ValueError(f"Unknown keep mode: {keep}")
+
+    result = data.iloc[kept]
+    if other:
+        rest = np.ones(len(data), dtype=bool)
+        rest[kept] = False
+        label = f"Other (avg of {rest.sum()} products)" if other == 'mean' else f"Other ({rest.sum()} products)"
+        bucket = data[rest].agg(other).to_frame(label).T
+        bucket.index.name = data.index.name
+        result = pd.concat([result, bucket])
+    return result
+
+def chart_frame(df, series, index='Product Description', index_name='Product'):
+    # Projection of df for a chart: series maps bar series -> df column. Columns
+    # are taken without copying, so the frame shares df's buffers; a missing
+    # column (None) plots as 0
+    labels = pd.Index(df[index], name=index_name)
+    return pd.DataFrame({name: df[column].to_numpy() if column is not None else 0 for name, column in series.items()},
+                        index=labels, copy=False)
+
+# Set by capture_charts(): chart frames exactly as rendered, for the batch export
+_captured = None
+
+@contextmanager
+def capture_charts():
+    global _captured
+    _captured = frames = []
+    try:
+        yield frames
+    finally:
+        _captured = None
+
+def _finish(data, scale):
+    # Runs on the reduced frame only: unit scaling (e.g. fractions -> %) and a
+    # plain label index for the chart spec
+    if isinstance(data.index, pd.CategoricalIndex):
+        data = data.set_axis(data.index.astype(object))
+    if scale is not None:
+        data = data * scale
+    return data
+
+def _field(name):
+    # Vega-Lite reads '.' and brackets in a field name as a path into the row
+    return re.sub(r'([\\.\[\]])', r'\\\1', str(name))
+
+def _altair_bar_chart(data, height):
+    # The bar chart st.bar_chart draws for data (a melt and an Altair build,
+    # the bulk of its cost), built with public Altair so it can be kept and
+    # re-sent with st.altair_chart on any supported Streamlit
+    import altair as alt
+
+    label = data.index.name or 'index'
+    frame = data.rename_axis(label).reset_index()
+    if len(data.columns) == 1:
+        value, color = data.columns[0], None
+    else:
+        frame = frame.melt(id_vars=label, var_name='series', value_name='value')
+        value, color = 'value', 'series'
+    encoding = {
+        'x': alt.X(field=_field(label), type='ordinal', title='', axis=alt.Axis(grid=False)),
+        'y': alt.Y(field=_field(value), type='quantitative', title='', axis=alt.Axis(grid=True)),
+        'tooltip': [alt.Tooltip(field=_field(label), type='nominal'), alt.Tooltip(field=_field(value), type='quantitative')],
+    }
+    if color is not None:
+        encoding['color'] = alt.Color(field=color, type='nominal', title=' ',
+                                      legend=alt.Legend(orient='bottom', titlePadding=5, offset=5))
+        encoding['tooltip'].append(alt.Tooltip(field=color, type='nominal'))
+    return alt.Chart(frame, height=height).mark_bar().encode(**encoding).interactive()
+
+def _stretch():
+    # Full-width keyword for st.altair_chart: width= replaced use_container_width= in later releases
+    import inspect
+
+    return {'width': 'stretch'} if 'width' in inspect.signature(st.altair_chart).parameters else {'use_container_width': True}
+
+def _send(data, height, chart=None):
+    with span('render'):
+        if _captured is not None:
+            _captured.append(data)
+        if chart is None:
+            st.bar_chart(data, height=height)
+        else:
+            st.altair_chart(chart, theme='streamlit', **_stretch())
+
+@fragment
+def bar_chart(data, height=500, scale=None, **options):
+    # prepare_chart_data + st.bar_chart, timed as separate stages
+    with span('prepare'):
+        data = _finish(prepare_chart_data(data, **options), scale)
+    _send(data, height)
+
+def shared_bar_chart(source, name, build, height=500, scale=None, **options):
+    # For charts of a shared dataset (workbook cache, store query, pipeline
+    # table): build(source), prepare_chart_data and the Altair chart run once per
+    # dataset and are reused by every session, and by reruns of the chart's
+    # fragment, until source is replaced
+    _shared_chart(source, (name, height, scale, repr(sorted(options.items()))), build, height, scale, options)
+
+@fragment
+def _shared_chart(source, key, build, height, scale, options):
+    def prepare(source):
+        data = _finish(prepare_chart_data(build(source), **options), scale)
+        return data, _altair_bar_chart(data, height)
+    with span('prepare'):
+        data, chart = get_shared_cache().derived(source, key, prepare)
+    _send(data, height, chart)
@@ -0,0 +1,115 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import streamlit as st
+
+# ---------------- Run Diagnostics ----------------
+# Each script run records exclusive time per stage (read, clean, compute,
+# prepare, render, ...), workbook cache hits/misses and DataFrame memory.
+# Finished runs go to a process-wide history for p50/p95 and, unless
+# DASHBOARD_METRICS_FILE is set to an empty string, are appended as JSON
+# lines to the metrics file.
+METRICS_FILE = os.environ.get('DASHBOARD_METRICS_FILE', 'dashboard_metrics.jsonl')
+HISTORY_SIZE = 1000
+
+_local = threading.local()
+
+class RunRecord:
+    def __init__(self, page, deep_memory=False):
+        self.page = page
+        self.deep_memory = deep_memory
+        self.started = time.time()
+        self.spans = {}
+        self.cache = {'hits': 0, 'misses': 0}
+        self.frames = {}
+        self.total = None
+        self._start = time.perf_counter()
+        self._stack = []
+
+    def as_dict(self):
+        return {'ts': self.started, 'page': self.page, 'total_s': self.total, 'spans_s': self.spans,
+                'cache': self.cache, 'frame_bytes': self.frames}
+
+def start_run(page, deep_memory=False):
+    # deep_memory also counts string payloads, which costs a pass over the frame
+    _local.record = RunRecord(page, deep_memory)
+    return _local.record
+
+def current_run():
+    return getattr(_local, 'record', None)
+
+@contextmanager
+def span(stage):
+    # Time spent in nested spans is charged to the inner stage only
+    record = current_run()
+    if record is None:
+        yield
+        return
+    start = time.perf_counter()
+    record._stack.append(0.0)
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        inner = record._stack.pop()
+        record.spans[stage] = record.spans.get(stage, 0.0) + elapsed - inner
+        if record._stack:
+            record._stack[-1] += elapsed
+
+def record_cache(hit):
+    record = current_run()
+    if record is not None:
+        record.cache['hits' if hit else 'misses'] += 1
+
+def record_frame(name, df):
+    record = current_run()
+    if record is not None:
+        record.frames[name] = int(df.memory_usage(deep=record.deep_memory).sum())
+
+class RunHistory:
+    def __init__(self, maxlen=HISTORY_SIZE):
+        self._runs = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def add(self, record):
+        with self._lock:
+            self._runs.append((record.page, record.total))
+
+    def percentiles(self, page, qs=(0.5, 0.95)):
+        with self._lock:
+            totals = sorted(t for p, t in self._runs if p == page)
+        if not totals:
+            return None
+        return {q: totals[min(len(totals) - 1, int(q * len(totals)))] for q in qs}, len(totals)
+
+@st.cache_resource
+def get_run_history():
+    return RunHistory()
+
+def finish_run(record):
+    record.total = time.perf_counter() - record._start
+    _local.record = None
+    get_run_history().add(record)
+    if METRICS_FILE:
+        try:
+            with open(METRICS_FILE, 'a') as f:
+                f.write(json.dumps(record.as_dict()) + '\n')
+        except OSError:
+            pass
+
+def render_diagnostics(record):
+    st.subheader("Diagnostics")
+    st.markdown(f"**Rerun:** {record.total * 1000:.1f} ms")
+    for stage, seconds in sorted(record.spans.items(), key=lambda kv: -kv[1]):
+        st.markdown(f"- {stage}: {seconds * 1000:.1f} ms")
+    st.markdown(f"**Workbook cache:** {record.cache['hits']} hits, {record.cache['misses']} misses")
+    for name, size in record.frames.items():
+        st.markdown(f"- `{name}` frame: {size / 1024:,.1f} KiB")
+    stats = get_run_history().percentiles(record.page)
+    if stats:
+        pct, n = stats
+        st.caption(f"{record.page}: p50 {pct[0.5] * 1000:.0f} ms, p95 {pct[0.95] * 1000:.0f} ms over {n} reruns")
@@ -0,0 +1,225 @@
+import argparse
+import html
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# ---------------- Batch Export ----------------
+# Headless report packs. Every page is run through Streamlit's AppTest (no
+# server) with a data directory as its working directory, and its headings,
+# findings and chart frames are written out as static HTML, PNG charts and an
+# XLSX workbook per page. Pages of all directories run in parallel worker
+# processes; a worker keeps its shared cache between the pages it runs and
+# the Parquet sidecars persist between runs, so re-exports reuse prepared
+# data. A page that raises or shows an error counts as failed, and any
+# failure makes the run exit nonzero. PNG output needs matplotlib, which is
+# not a dependency of the app, so it is off unless asked for with --formats.
+#
+#   python -m dashboard.export data/north data/south --out packs --workers 8
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXPORT_FORMATS = ('html', 'png', 'xlsx')
+DEFAULT_FORMATS = ('html', 'xlsx')
+PAGE_TIMEOUT = 3600
+CHART_LABEL_CHARS = 32
+
+HTML_STYLE = """
+body { font-family: sans-serif; margin: 2em auto; max-width: 1100px; color: #222; }
+img { max-width: 100%; }
+.caption { color: #666; font-size: 0.9em; }
+.warning { background: #fff4d6; padding: 0.5em; }
+.error { background: #fde2e2; padding: 0.5em; }
+table { border-collapse: collapse; font-size: 0.85em; }
+td, th { border: 1px solid #ccc; padding: 2px 6px; text-align: right; }
+"""
+
+def slug(text):
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+def _inline(text):
+    # The little Markdown the pages use: **bold** and `code`
+    text = html.escape(text)
+    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
+    return re.sub(r'`(.+?)`', r'<code>\1</code>', text)
+
+def run_page(page):
+    # Runs one page headlessly; returns [(kind, value)] in page order, charts as frames
+    from streamlit.testing.v1 import AppTest
+
+    from dashboard.charts import capture_charts
+    from yoy_analysis_app import PAGES
+
+    module, func = PAGES[page].split(':')
+    with capture_charts() as frames:
+        at = AppTest.from_string(f"from {module} import {func}\n{func}()\n", default_timeout=PAGE_TIMEOUT).run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    if at.error:
+        # The pages report missing or unreadable inputs with st.error and stop
+        raise RuntimeError(at.error[0].value)
+    charts = iter(frames)
+    blocks = []
+    for element in at.main:
+        if element.type in ('header', 'subheader', 'markdown', 'caption', 'warning', 'error'):
+            blocks.append((element.type, element.value))
+        elif element.type in ('vega_lite_chart', 'arrow_vega_lite_chart'):
+            blocks.append(('chart', next(charts)))
+    return blocks
+
+def chart_titles(blocks):
+    # Each chart is titled by the subheader above it
+    title, titles = None, []
+    for kind, value in blocks:
+        if kind in ('header', 'subheader'):
+            title = value
+        elif kind == 'chart':
+            titles.append(title or f'Chart {len(titles) + 1}')
+    return titles
+
+def write_png(path, title, frame):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    labels = [str(label)[:CHART_LABEL_CHARS] for label in frame.index]
+    fig, ax = plt.subplots(figsize=(max(8, len(frame) * 0.35 * max(1, len(frame.columns) / 2)), 5))
+    try:
+        frame.set_axis(labels).plot.bar(ax=ax, width=0.8, legend=len(frame.columns) > 1)
+        ax.set_title(title)
+        ax.set_xlabel('')
+        ax.tick_params(axis='x', labelsize=7)
+        fig.tight_layout()
+        fig.savefig(path, dpi=100)
+    finally:
+        plt.close(fig)
+
+def write_xlsx(path, page, blocks, titles):
+    import pandas as pd
+
+    text = [(kind, value) for kind, value in blocks if kind != 'chart']
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        pd.DataFrame(text, columns=['Type', page]).to_excel(writer, sheet_name='Findings', index=False)
+        charts = [value for kind, value in blocks if kind == 'chart']
+        for i, (title, frame) in enumerate(zip(titles, charts), 1):
+            sheet = f'Chart {i}'
+            frame.to_excel(writer, sheet_name=sheet, startrow=1)
+            writer.sheets[sheet].cell(row=1, column=1, value=title)
+
+def write_html(path, page, blocks, images):
+    parts = [f'<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>{html.escape(page)}</title>',
+             f'<style>{HTML_STYLE}</style></head><body>']
+    items = []
+    charts = iter(images)
+    for kind, value in blocks:
+        if kind == 'markdown' and value.startswith('- '):
+            items.append(f'<li>{_inline(value[2:])}</li>')
+            continue
+        if items:
+            parts.append('<ul>' + ''.join(items) + '</ul>')
+            items = []
+        if kind == 'header':
+            parts.append(f'<h1>{html.escape(value)}</h1>')
+        elif kind == 'subheader':
+            parts.append(f'<h2>{html.escape(value)}</h2>')
+        elif kind == 'markdown':
+            heading = re.match(r'#+\s*(.*)', value)
+            parts.append(f'<h2>{_inline(heading.group(1))}</h2>' if heading else f'<p>{_inline(value)}</p>')
+        elif kind in ('caption', 'warning', 'error'):
+            parts.append(f'<p class="{kind}">{_inline(value)}</p>')
+        elif kind == 'chart':
+            image = next(charts)
+            if image:
+                parts.append(f'<img src="{html.escape(image)}" alt="">')
+            else:
+                parts.append(value.to_html(float_format=lambda v: f'{v:,.2f}'))
+    if items:
+        parts.append('<ul>' + ''.join(items) + '</ul>')
+    parts.append('</body></html>')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(parts))
+
+def export_page(directory, page, out_dir, formats):
+    # Worker: pages read their inputs relative to the working directory
+    os.chdir(directory)
+    start = time.perf_counter()
+    blocks = run_page(page)
+    titles = chart_titles(blocks)
+    charts = [value for kind, value in blocks if kind == 'chart']
+    name = slug(page)
+    written = []
+    images = [None] * len(charts)
+    if 'png' in formats:
+        for i, (title, frame) in enumerate(zip(titles, charts)):
+            images[i] = f'{name}-chart-{i + 1}.png'
+            write_png(os.path.join(out_dir, images[i]), title, frame)
+            written.append(images[i])
+    if 'xlsx' in formats:
+        write_xlsx(os.path.join(out_dir, f'{name}.xlsx'), page, blocks, titles)
+        written.append(f'{name}.xlsx')
+    if 'html' in formats:
+        write_html(os.path.join(out_dir, f'{name}.html'), page, blocks, images)
+        written.append(f'{name}.html')
+    return written, time.perf_counter() - start
+
+def write_index(out_dir, region, pages, formats):
+    links = []
+    for page in pages:
+        name = slug(page)
+        files = [f'<a href="{name}.html">{html.escape(page)}</a>' if 'html' in formats else html.escape(page)]
+        if 'xlsx' in formats:
+            files.append(f'<a href="{name}.xlsx">xlsx</a>')
+        links.append('<li>' + ' · '.join(files) + '</li>')
+    with open(os.path.join(out_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(f'<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>{html.escape(region)}</title>'
+                f'<style>{HTML_STYLE}</style></head><body><h1>{html.escape(region)}</h1><ul>{"".join(links)}</ul></body></html>')
+
+def main(argv=None):
+    from yoy_analysis_app import PAGES
+
+    parser = argparse.ArgumentParser(description='Export every report page to static HTML, PNG and XLSX.')
+    parser.add_argument('directories', nargs='+', help='data directories (one report pack each), laid out like the app directory')
+    parser.add_argument('--out', default='reports', help='output root; each directory gets a sub-folder named after it')
+    parser.add_argument('--formats', default=','.join(DEFAULT_FORMATS),
+                        help=f"comma-separated, from {', '.join(EXPORT_FORMATS)}; png needs matplotlib")
+    parser.add_argument('--pages', default=','.join(PAGES), help='comma-separated page names')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    formats = set(args.formats.split(','))
+    pages = args.pages.split(',')
+    unknown = sorted(formats - set(EXPORT_FORMATS)) + [p for p in pages if p not in PAGES]
+    if unknown:
+        parser.error(f"unknown format or page: {', '.join(unknown)}")
+    # Workers export and exit, so the Prior Periods workbook watcher is not started
+    os.environ['DASHBOARD_WATCH_INTERVAL'] = '0'
+
+    jobs = {}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for directory in args.directories:
+            directory = os.path.abspath(directory)
+            region = os.path.basename(directory.rstrip(os.sep))
+            out_dir = os.path.abspath(os.path.join(args.out, region))
+            os.makedirs(out_dir, exist_ok=True)
+            write_index(out_dir, region, pages, formats)
+            for page in pages:
+                jobs[pool.submit(export_page, directory, page, out_dir, formats)] = (region, page)
+        failures = 0
+        for future in as_completed(jobs):
+            region, page = jobs[future]
+            try:
+                written, seconds = future.result()
+                print(f'{region}/{slug(page)}: {len(written)} files in {seconds:.1f} s')
+            except Exception as e:
+                failures += 1
+                print(f'{region}/{slug(page)}: FAILED: {e}', file=sys.stderr)
+    print(f'{len(jobs) - failures}/{len(jobs)} pages exported in {time.perf_counter() - start:.1f} s')
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.path.insert(0, ROOT)
+    # Run from the importable module so workers unpickle export_page by name;
+    # AppTest swaps out __main__ while a page runs
+    from dashboard.export import main as run
+    sys.exit(run())
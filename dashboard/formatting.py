@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+# ---------------- Helpers ----------------
+def human_format(num):
+    if pd.isna(num):
+        return ""
+    try:
+        num = float(num)
+    except:
+        return str(num)
+    if abs(num) >= 1_000_000:
+        return f'{num/1_000_000:.1f}M'
+    elif abs(num) >= 1_000:
+        return f'{num/1_000:.0f}K'
+    else:
+        return str(int(num))
+
+def human_currency(num):
+    if pd.isna(num):
+        return ""
+    try:
+        num = float(num)
+    except:
+        return str(num)
+    if abs(num) >= 1_000_000:
+        return f'R{num/1_000_000:.1f}M'
+    elif abs(num) >= 1_000:
+        return f'R{num/1_000:.0f}K'
+    else:
+        return f'R{num:.0f}'
+
+# Column-at-a-time variants of human_format / human_currency for tables and
+# tooltips. Branch selection, rounding and digit layout are all done with
+# NumPy array operations; output is identical to the scalar functions.
+_POW10 = 10 ** np.arange(19, dtype=np.int64)
+
+def _render_ints(mag, negative, prefix, suffix, tenths=False):
+    # Lay out prefix, sign, digits (with a decimal point before the last one
+    # when tenths=True) and suffix as NUL-padded UCS4 rows, then view as str.
+    n = len(mag)
+    ndig = np.maximum(np.searchsorted(_POW10, mag, side='right'), 2 if tenths else 1)
+    max_digits = int(ndig.max(initial=1))
+    width = len(prefix) + 1 + max_digits + int(tenths) + len(suffix)
+    buf = np.zeros((n, width), dtype=np.uint32)
+    rows = np.arange(n)
+    for i, ch in enumerate(prefix):
+        buf[:, i] = ord(ch)
+    buf[negative, len(prefix)] = ord('-')
+    end = len(prefix) + negative + ndig + int(tenths)
+    for k in range(max_digits):
+        sel = ndig > k
+        col = end[sel] - 1 - k - (int(tenths) if k > 0 else 0)
+        buf[rows[sel], col] = ord('0') + (mag[sel] // _POW10[k]) % 10
+    if tenths:
+        buf[rows, end - 2] = ord('.')
+    for i, ch in enumerate(suffix):
+        buf[rows, end + i] = ord(ch)
+    return buf.view(f'<U{width}').ravel().astype(object)
+
+def _human_batch(values, prefix, small_round):
+    index = values.index if isinstance(values, pd.Series) else None
+    raw = np.asarray(values).ravel()
+    if raw.dtype.kind in 'iufb':
+        nums = raw.astype(np.float64)
+    else:
+        nums = pd.to_numeric(pd.Series(raw, dtype=object), errors='coerce').to_numpy(dtype=np.float64)
+    missing = pd.isna(raw)
+    out = np.full(len(nums), '', dtype=object)
+
+    size = np.abs(nums)
+    mega = size >= 1_000_000
+    kilo = (size >= 1_000) & ~mega
+    small = size < 1_000
+
+    if mega.any():
+        v = nums[mega] / 1_000_000
+        scaled = np.abs(v) * 10
+        tenths = np.rint(scaled)
+        # '%.1f' rounds the exact binary value; defer to it wherever the
+        # multiply by ten could have moved a value across a rounding tie.
+        # Huge and infinite values go to '%.1f' too, masked out of the tie test.
+        fits = scaled < 2.0 ** 52
+        finite = np.where(fits, scaled, 0.0)
+        exact = fits & (np.abs(finite - np.floor(finite) - 0.5) > 4 * np.spacing(finite))
+        idx = np.flatnonzero(mega)
+        out[idx[exact]] = _render_ints(tenths[exact].astype(np.int64), v[exact] < 0, prefix, 'M', tenths=True)
+        out[idx[~exact]] = [f'{prefix}{x:.1f}M' for x in v[~exact]]
+    if kilo.any():
+        k = np.rint(nums[kilo] / 1_000)
+        out[kilo] = _render_ints(np.abs(k).astype(np.int64), k < 0, prefix, 'K')
+    if small.any():
+        # human_currency rounds ('%.0f', which keeps '-0'); human_format truncates
+        v = np.rint(nums[small]) if small_round else np.trunc(nums[small])
+        negative = np.signbit(v) if small_round else v < 0
+        out[small] = _render_ints(np.abs(v).astype(np.int64), negative, prefix, '')
+
+    # Non-numeric, non-missing inputs fall back to str() like the scalar path
+    other = np.isnan(nums) & ~missing
+    if other.any():
+        out[other] = [str(x) for x in raw[other]]
+    out[missing] = ''
+    return pd.Series(out, index=index) if index is not None else out
+
+def human_format_batch(values):
+    return _human_batch(values, '', small_round=False)
+
+def human_currency_batch(values):
+    return _human_batch(values, 'R', small_round=True)
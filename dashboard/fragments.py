@@ -0,0 +1,27 @@
+import functools
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# ---------------- Fragments ----------------
+# Every chart and key-findings block runs as an st.fragment, so a widget
+# placed inside one (a product or category filter, say) reruns and re-sends
+# that block only, not main(), the sidebar or the page's other charts.
+def fragment(func):
+    block = st.fragment(func)
+
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        # Outside a script run (bare mode) there is no fragment to attach to
+        if get_script_run_ctx(suppress_warning=True) is None:
+            return func(*args, **kwargs)
+        return block(*args, **kwargs)
+    return run
+
+@fragment
+def findings(title, lines):
+    # A key-findings block: subheader (unless title is None), one bullet per line
+    if title is not None:
+        st.subheader(title)
+    for line in lines:
+        st.markdown(f"- {line}")
@@ -0,0 +1,48 @@
+import importlib.util
+
+import numpy as np
+import pandas as pd
+
+from dashboard.diagnostics import span
+
+# ---------------- Compact Frames ----------------
+# Tables held in the shared cache are stored compactly: product keys as
+# categoricals when they repeat (store or week level extracts) and as Arrow
+# strings when every row is its own product, and numeric columns downcast
+# wherever no value changes (integers to int32 when they fit, whole-valued
+# floats such as unit counts to float32). Fractional floats stay float64, so
+# KPIs and findings are computed from exactly the same values as before.
+KEY_COLUMNS = ('Product Description',)
+
+_INT32 = np.iinfo(np.int32)
+
+def _key_dtype(s):
+    if s.nunique() * 2 <= len(s):
+        return 'category'
+    return 'string[pyarrow]' if importlib.util.find_spec('pyarrow') else None
+
+def _compact_dtype(name, s, keys):
+    if name in keys:
+        return _key_dtype(s) if s.dtype == object else None
+    if pd.api.types.is_integer_dtype(s.dtype) and s.dtype.itemsize > 4:
+        if len(s) == 0 or (_INT32.min <= s.min() and s.max() <= _INT32.max):
+            return np.int32
+    elif pd.api.types.is_float_dtype(s.dtype) and s.dtype.itemsize > 4:
+        values = s.to_numpy()
+        if np.array_equal(values.astype(np.float32), values, equal_nan=True):
+            return np.float32
+    return None
+
+def compact_frame(df, keys=KEY_COLUMNS):
+    with span('compact'):
+        dtypes = {}
+        for name in df.columns:
+            dtype = _compact_dtype(name, df[name], keys)
+            if dtype is not None:
+                dtypes[name] = dtype
+        if dtypes:
+            df = df.astype(dtypes)
+        # Row filters leave a sparse integer index behind; nothing reads it
+        if not isinstance(df.index, pd.RangeIndex):
+            df = df.reset_index(drop=True)
+        return df
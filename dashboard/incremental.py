@@ -0,0 +1,196 @@
+import os
+import threading
+import time
+import weakref
+
+import pandas as pd
+import numpy as np
+
+from dashboard.cache import get_shared_cache
+from dashboard.diagnostics import span
+from dashboard.frames import compact_frame
+from dashboard.metrics import Kpi, compute_kpis
+from dashboard.workbooks import detect_prior_periods_columns, file_stamp, load_columnar, read_prior_periods_excel
+
+# ---------------- Incremental Prior Periods ----------------
+# Analysts push small corrections to Prior Periods.xlsx many times a day. The
+# pipeline keeps the table keyed on Product Description and, when the file
+# changes, diffs the new rows against it and patches the maintained KPIs with
+# only the inserted, updated and deleted rows. A full rebuild happens on the
+# first load, when the layout changes, or when keys are not unique; a
+# metric is rescanned only when the row holding its extremum is changed, or
+# when reordered rows put a row tied with it first.
+KEY = 'Product Description'
+# Seconds between workbook polls; DASHBOARD_WATCH_INTERVAL=0 turns the watcher off
+WATCH_INTERVAL = float(os.environ.get('DASHBOARD_WATCH_INTERVAL', 2.0))
+
+def prior_periods_metrics(df, cols):
+    # The per-row values behind the page's KPIs
+    _, _, col_campaign, col_increase = cols
+    metrics = {}
+    if col_campaign:
+        metrics['vs_avg'] = df[col_campaign] - df['Avg Prior Months']
+    if col_increase:
+        metrics['increase'] = df[col_increase]
+    return pd.DataFrame(metrics, index=df.index, dtype=np.float64)
+
+def _sum_kpi(values):
+    valid = values[~np.isnan(values)]
+    return int((valid > 0).sum()), int((valid < 0).sum()), len(valid), float(valid.sum())
+
+def _keyed(df):
+    # Keys as plain labels: categorical keys from two reads have different categories
+    keyed = df.set_index(KEY)
+    keyed.index = keyed.index.astype(object)
+    return keyed
+
+class PriorPeriodsPipeline:
+    # load() returns the cleaned table and stamp() a value that changes with
+    # it; both default to the workbook at path and its mtime and size. Held in
+    # a shared cache under key, the entry is re-sized after every refresh.
+    def __init__(self, path, load=None, stamp=None, shared=None, key=None):
+        self.path = path
+        self._shared = shared
+        self._key = key
+        self._load = load or (lambda: load_columnar(path, read_prior_periods_excel))
+        self._stamp_of = stamp or (lambda: file_stamp(path))
+        self.table = None
+        self.cols = None
+        self.kpis = {}
+        self.last_changes = None
+        self._metrics = None
+        self._stamp = None
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        # What the pipeline holds: the table and the per-row metrics behind the KPIs
+        with self._lock:
+            frames = [f for f in (self.table, self._metrics) if f is not None]
+        return sum(int(f.memory_usage(deep=True).sum()) for f in frames)
+
+    def snapshot(self):
+        with self._lock:
+            return self.table, self.cols, self.kpis
+
+    def refresh(self):
+        stamp = self._stamp_of()
+        with self._lock:
+            if stamp == self._stamp:
+                return
+            df = compact_frame(self._load())
+            cols = detect_prior_periods_columns(df.columns)
+            keys = df[KEY] if KEY in df.columns else None
+            if (self.table is None or list(df.columns) != list(self.table.columns)
+                    or keys is None or not keys.is_unique):
+                self._rebuild(df, cols)
+            else:
+                with span('diff'):
+                    self._apply(df)
+            self._stamp = stamp
+        if self._shared is not None:
+            self._shared.resize(self._key, self.nbytes)
+
+    def _rebuild(self, df, cols):
+        self.table, self.cols = df, cols
+        metrics = prior_periods_metrics(df, cols)
+        labels = df[KEY].to_numpy() if KEY in df.columns else np.full(len(df), None, dtype=object)
+        self.kpis = compute_kpis(metrics.to_numpy(), labels, list(metrics.columns))
+        self._metrics = metrics.set_axis(labels) if KEY in df.columns else None
+        self.last_changes = {'inserted': len(df), 'updated': 0, 'deleted': 0, 'rebuilt': True}
+
+    def _apply(self, new):
+        old_keyed, new_keyed = _keyed(self.table), _keyed(new)
+        deleted = old_keyed.index.difference(new_keyed.index, sort=False)
+        inserted = new_keyed.index.difference(old_keyed.index, sort=False)
+        common = new_keyed.index.intersection(old_keyed.index, sort=False)
+        before, after = old_keyed.loc[common], new_keyed.loc[common]
+        differs = ((before != after) & ~(before.isna() & after.isna())).any(axis=1).to_numpy()
+        updated = common[differs]
+
+        removed = self._metrics.loc[deleted.append(updated)]
+        added = prior_periods_metrics(new_keyed.loc[inserted.append(updated)], self.cols)
+        positions = pd.Series(np.arange(len(new)), index=new_keyed.index)
+        # Rows kept from the last load but now in another order: ties at an
+        # extremum may then resolve to a different first row
+        reordered = not common.equals(old_keyed.index[old_keyed.index.isin(common)])
+
+        self._metrics = pd.concat([self._metrics.drop(deleted.append(updated)), added])
+        self.table = new
+        self.kpis = {name: self._patch(name, kpi, removed[name], added[name], positions, reordered)
+                     for name, kpi in self.kpis.items()}
+        self.last_changes = {'inserted': len(inserted), 'updated': len(updated), 'deleted': len(deleted), 'rebuilt': False}
+
+    def _tie_moved(self, name, kpi, positions):
+        # Whether a row tied with an extremum now comes before the row holding it
+        values = self._metrics[name]
+        for label, value in ((kpi.top_label, kpi.top_value), (kpi.bottom_label, kpi.bottom_value)):
+            if label is not None and positions[values.index[values.to_numpy() == value]].min() < positions[label]:
+                return True
+        return False
+
+    def _patch(self, name, kpi, removed, added, positions, reordered):
+        if removed.empty and added.empty and not reordered:
+            return kpi
+        r_pos, r_neg, r_count, r_total = _sum_kpi(removed.to_numpy())
+        a_pos, a_neg, a_count, a_total = _sum_kpi(added.to_numpy())
+        gone = set(removed.index)
+        if kpi.top_label in gone or kpi.bottom_label in gone or (reordered and self._tie_moved(name, kpi, positions)):
+            # The row holding an extremum changed, or lost a tie by moving; rescan this metric once
+            ordered = self._metrics[name].reindex(positions.index)
+            return compute_kpis(ordered.to_numpy(), ordered.index.to_numpy(), [name])[name]
+
+        def pick(current_label, current_value, candidates, better):
+            best = (current_label, current_value)
+            for label, value in candidates.items():
+                if best[0] is None or better(value, best[1]) or (value == best[1] and positions[label] < positions[best[0]]):
+                    best = (label, value)
+            return best
+
+        valid = added.dropna()
+        top = pick(kpi.top_label, kpi.top_value, valid[valid == valid.max()] if len(valid) else valid, lambda a, b: a > b)
+        bottom = pick(kpi.bottom_label, kpi.bottom_value, valid[valid == valid.min()] if len(valid) else valid, lambda a, b: a < b)
+        return Kpi(kpi.positive - r_pos + a_pos, kpi.negative - r_neg + a_neg,
+                   kpi.count - r_count + a_count, kpi.total - r_total + a_total,
+                   top[0], top[1], bottom[0], bottom[1])
+
+    def watch(self, interval=WATCH_INTERVAL):
+        # Poll the source so edits are folded in before the next rerun asks.
+        # The thread holds the pipeline weakly and ends once it is evicted and unused.
+        ref = weakref.ref(self)
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                pipeline = ref()
+                if pipeline is None:
+                    return
+                try:
+                    pipeline.refresh()
+                except Exception:
+                    # Missing or half-written file: the page reports it on its own refresh
+                    pass
+                del pipeline
+        threading.Thread(target=loop, name=f'watch {self.path}', daemon=True).start()
+        return self
+
+# Pipelines are entries of the shared cache, sized by what they hold, so
+# DASHBOARD_CACHE_BYTES caps them with everything else; an evicted pipeline
+# is rebuilt from its source on next use.
+_open_lock = threading.Lock()
+
+def cached_pipeline(shared, key, path, load=None, stamp=None, watch=False):
+    with _open_lock:
+        found, pipeline = shared.lookup(key)
+        if not found:
+            pipeline = PriorPeriodsPipeline(path, load, stamp, shared=shared, key=key)
+            # Sized once the first refresh has loaded it
+            shared.put(key, pipeline, size=0)
+            if watch:
+                pipeline.watch()
+    return pipeline
+
+def get_prior_periods_pipeline(path):
+    # One pipeline per workbook, resolved against the working directory
+    path = os.path.abspath(path)
+    return cached_pipeline(get_shared_cache(), ('pipeline', path), path, watch=WATCH_INTERVAL > 0)
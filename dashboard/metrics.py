@@ -0,0 +1,53 @@
+from collections import namedtuple
+
+import numpy as np
+
+from dashboard.diagnostics import span
+
+# ---------------- KPI Kernel ----------------
+class Kpi(namedtuple('Kpi', 'positive negative count total top_label top_value bottom_label bottom_value')):
+    # Key Findings statistics for one metric column; NaNs are ignored throughout
+    __slots__ = ()
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else np.nan
+
+    def merge(self, other):
+        # Combine results for consecutive row blocks; ties keep the earlier row
+        top = self if self.top_label is not None and not other.top_value > self.top_value else other
+        bottom = self if self.bottom_label is not None and not other.bottom_value < self.bottom_value else other
+        return Kpi(self.positive + other.positive, self.negative + other.negative,
+                   self.count + other.count, self.total + other.total,
+                   top.top_label, top.top_value, bottom.bottom_label, bottom.bottom_value)
+
+def compute_kpis(values, labels, names):
+    # One vectorized pass over a (rows x metrics) array for all metrics at once
+    with span('compute'):
+        return _compute_kpis(values, labels, names)
+
+def _compute_kpis(values, labels, names):
+    values = np.asarray(values, dtype=np.float64).reshape(len(labels), len(names))
+    labels = np.asarray(labels, dtype=object)
+    if not len(labels):
+        # argmax/argmin have nothing to reduce over: an empty campaign or filter
+        return {name: Kpi(0, 0, 0, 0.0, None, np.nan, None, np.nan) for name in names}
+    valid = ~np.isnan(values)
+    positive = (values > 0).sum(axis=0)
+    negative = (values < 0).sum(axis=0)
+    count = valid.sum(axis=0)
+    total = np.where(valid, values, 0.0).sum(axis=0)
+    top = np.where(valid, values, -np.inf).argmax(axis=0)
+    bottom = np.where(valid, values, np.inf).argmin(axis=0)
+    cols = np.arange(len(names))
+    top_value, bottom_value = values[top, cols], values[bottom, cols]
+    result = {}
+    for i, name in enumerate(names):
+        has_values = count[i] > 0
+        result[name] = Kpi(int(positive[i]), int(negative[i]), int(count[i]), float(total[i]),
+                           labels[top[i]] if has_values else None, top_value[i] if has_values else np.nan,
+                           labels[bottom[i]] if has_values else None, bottom_value[i] if has_values else np.nan)
+    return result
+
+def frame_kpis(df, columns, label_column='Product Description'):
+    return compute_kpis(df[list(columns)].to_numpy(dtype=np.float64), df[label_column].to_numpy(), list(columns))
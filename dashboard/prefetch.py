@@ -0,0 +1,130 @@
+import functools
+import importlib
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import streamlit as st
+
+# ---------------- Session Prefetch ----------------
+# Once the first page of a session has rendered, the data behind every other
+# report is loaded in a small thread pool and published into the process-wide
+# caches (workbook cache, Prior Periods pipeline, data store results), so
+# switching pages renders from ready data. Parquet reads and SQLite queries
+# release the GIL for most of their time, and the caches are in-process, so
+# those run in threads. openpyxl parsing is pure Python and holds the GIL, so
+# a workbook without a fresh sidecar is first converted to one in a worker
+# process (spawned: the server's threads make fork unsafe), and the thread
+# then loads the sidecar. Singletons are resolved on the script thread; the
+# workers only call into them.
+PREFETCH_WORKERS = 4
+CONVERT_WORKERS = 2
+
+class Prefetcher:
+    def __init__(self, workers=PREFETCH_WORKERS, convert_workers=CONVERT_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='prefetch')
+        self._convert_workers = convert_workers
+        self._processes = None
+        self._tasks = {}
+        self._latest = {}
+        self._lock = threading.Lock()
+
+    def _submit(self, key, pool, fn, *args):
+        # A task still queued or running (e.g. from another session) is not queued again
+        with self._lock:
+            future = self._tasks.get(key)
+            if future is None or future.done():
+                future = self._tasks[key] = pool().submit(fn, *args)
+            return future
+
+    def submit(self, name, fn, *args):
+        # Keyed on the arguments too, so another campaign is another task;
+        # objects that are not part of the data's identity are bound into fn
+        with self._lock:
+            self._latest[name] = (name, args)
+        return self._submit((name, args), lambda: self._pool, fn, *args)
+
+    def _process_pool(self):
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(max_workers=self._convert_workers,
+                                                  mp_context=multiprocessing.get_context('spawn'))
+        return self._processes
+
+    def convert(self, path, reader):
+        # Future for writing path's sidecar in a worker process, None if it is fresh
+        from dashboard.workbooks import sidecar_is_fresh, write_columnar
+
+        if sidecar_is_fresh(path):
+            return None
+        return self._submit(('convert', path), self._process_pool, write_columnar, path, reader)
+
+    def status(self):
+        with self._lock:
+            latest = {name: self._tasks[key] for name, key in self._latest.items() if key in self._tasks}
+        return {name: 'loading' if not f.done() else 'failed' if f.exception() else 'ready'
+                for name, f in latest.items()}
+
+@st.cache_resource
+def get_prefetcher():
+    return Prefetcher()
+
+def _import_page(entry):
+    importlib.import_module(entry.split(":")[0])
+
+def _after(converted, fn, *args):
+    # Waits for a sidecar conversion; if it failed, fn reads the workbook itself
+    if converted is not None:
+        try:
+            converted.result()
+        except Exception:
+            pass
+    return fn(*args)
+
+def _warm_yoy(source, campaign_id):
+    # Summary first, as the page does: a cold workbook is parsed once, streaming
+    source.yoy_summary(campaign_id)
+    source.yoy_table(campaign_id)
+
+def _warm_demographics(cache, store):
+    from dashboard.shoppers import find_transactions, summarize_transactions
+    from dashboard.store import AGE_ROLLUP
+
+    path = find_transactions()
+    if path is not None:
+        cache.get(path, summarize_transactions)
+        return
+    store.demographic_split("day")
+    store.demographic_split("gender")
+    store.demographic_split("age", rollup=AGE_ROLLUP)
+
+def prefetch_reports(pages, campaign_id):
+    # pages: the entry point's registry, {label: "module:func"}
+    from dashboard.sources import PRIOR_PERIODS_WORKBOOK, YOY_WORKBOOK, WorkbookSource, get_data_source
+    from dashboard.store import get_data_store
+    from dashboard.workbooks import get_workbook_cache, read_prior_periods_excel, read_yoy_excel
+
+    prefetcher = get_prefetcher()
+    for name, entry in pages.items():
+        prefetcher.submit(f'import {name}', _import_page, entry)
+    cache, store, source = get_workbook_cache(), get_data_store(), get_data_source()
+    yoy_converted = prior_converted = None
+    if isinstance(source, WorkbookSource):
+        try:
+            yoy_converted = prefetcher.convert(YOY_WORKBOOK, read_yoy_excel)
+            prior_converted = prefetcher.convert(PRIOR_PERIODS_WORKBOOK, read_prior_periods_excel)
+        except OSError:
+            # Missing workbook or no processes here: the threads read (and report) it
+            pass
+    prefetcher.submit('YOY Analysis', functools.partial(_after, yoy_converted, _warm_yoy, source), campaign_id)
+    prefetcher.submit('Prior Periods', functools.partial(_after, prior_converted, source.prior_periods), campaign_id)
+    prefetcher.submit('Category Analysis', store.category_shares)
+    prefetcher.submit('Campaign Units Analysis', store.campaign_periods, 'units', campaign_id)
+    prefetcher.submit('Campaign Sales Amount Analysis', store.campaign_periods, 'sales', campaign_id)
+    prefetcher.submit('Demographics', _warm_demographics, cache, store)
+    return prefetcher
+
+def render_prefetch_status():
+    status = get_prefetcher().status()
+    reports = [f"{name}: {state}" for name, state in status.items() if not name.startswith('import ')]
+    if reports:
+        st.caption("Prefetch - " + ", ".join(reports))
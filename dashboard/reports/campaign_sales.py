@@ -0,0 +1,82 @@
+import streamlit as st
+
+from dashboard.bootstrap import lift_intervals
+from dashboard.cache import get_shared_cache
+from dashboard.charts import chart_frame, shared_bar_chart
+from dashboard.diagnostics import record_frame
+from dashboard.fragments import findings
+from dashboard.metrics import frame_kpis
+from dashboard.store import get_data_store, selected_campaign_id
+
+# ---------------- Campaign Sales Amount Analysis ----------------
+def campaign_sales_amount_page():
+    st.header("Campaign Sales Amount Analysis (Pre, During, Post)")
+    # Renamed once per campaign rollup and shared across sessions
+    store, campaign_id = get_data_store(), selected_campaign_id()
+    source = store.campaign_periods('sales', campaign_id)
+    df = get_shared_cache().derived(source, 'sales table', lambda df: df.rename(columns={
+        'pre': "Pre-Campaign Sales (6wks)",
+        'campaign': "Campaign Sales/Week",
+        'post': "Post-Campaign Sales/Week"
+    }))
+    record_frame('table', df)
+    if df.empty:
+        st.info("No weekly sales have been loaded for this campaign's windows yet, so there is nothing to chart. "
+                "Pick another campaign, or add its weekly sales to the data store.")
+        return
+    # Weekly facts behind the rollup, for per-product lift intervals
+    weekly = store.weekly_periods('sales', campaign_id)
+    kpis = get_shared_cache().derived(df, 'sales kpis', lambda df: frame_kpis(df, ["% Change (Campaign vs Pre)", "% Change (Campaign vs Post)"]))
+
+    # Chart 1
+    st.subheader("Sales Amount per Product: Pre-, During-, and Post-Campaign")
+    shared_bar_chart(df, 'sales chart 1', lambda df: chart_frame(df, {
+        'Pre-Campaign': "Pre-Campaign Sales (6wks)",
+        'Campaign': "Campaign Sales/Week",
+        'Post-Campaign': "Post-Campaign Sales/Week"
+    }), sort_by='Campaign', other='mean')
+
+    # Key findings for Chart 1
+    findings("Key Findings - Sales Amount Comparison", [
+        "This chart compares sales amounts per product before, during, and after the campaign.",
+        "Campaign period generally drove higher weekly sales amounts across the portfolio.",
+        "Focus on strategies to extend the positive effects of campaigns.",
+    ])
+
+    # Chart 2
+    st.subheader("% Change in Sales Amount: Campaign vs Pre-Campaign")
+    shared_bar_chart(df, 'sales chart 2', lambda df: chart_frame(df, {
+        '% Change (Campaign vs Pre Sales)': "% Change (Campaign vs Pre)"
+    }), scale=100, keep='extremes', other='mean')
+    lift_intervals(df, 'sales vs pre', "Pre-Campaign Sales (6wks)", "Campaign Sales/Week", "Portfolio lift, campaign vs pre-campaign",
+                   weekly, ('pre', 'campaign'))
+
+    # Key findings for Chart 2
+    change_pre = kpis["% Change (Campaign vs Pre)"]
+    findings("Key Findings - Campaign vs Pre-Campaign Sales", [
+        f"{change_pre.positive} products experienced an increase in sales amount during the campaign compared to pre-campaign.",
+        "Products with strong positive change likely benefited from campaign activities.",
+        f"Replicate successful tactics from top-performing products like {change_pre.top_label}.",
+    ])
+
+    # Chart 3
+    st.subheader("% Change in Sales Amount: Campaign vs Post-Campaign")
+    shared_bar_chart(df, 'sales chart 3', lambda df: chart_frame(df, {
+        '% Change (Campaign vs Post Sales)': "% Change (Campaign vs Post)"
+    }), scale=100, keep='extremes', other='mean')
+    lift_intervals(df, 'sales vs post', "Campaign Sales/Week", "Post-Campaign Sales/Week", "Portfolio change, post-campaign vs campaign",
+                   weekly, ('campaign', 'post'))
+
+    # Key findings
+    change_post = kpis["% Change (Campaign vs Post)"]
+    findings("Key Findings - Campaign vs Post-Campaign Sales", [
+        f"{change_post.positive} products maintained or increased sales post-campaign compared to the campaign period.",
+        "Many products saw declines post-campaign.",
+        "Develop post-campaign plans to sustain gains.",
+    ])
+
+    # Summary findings
+    findings("Summary Findings", [
+        "Campaign increased sales for many products but not all gains were sustained post-campaign.",
+        "Focus on strategies to extend the positive effects of campaigns beyond the campaign period.",
+    ])
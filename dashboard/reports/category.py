@@ -0,0 +1,47 @@
+import streamlit as st
+
+from dashboard.cache import get_shared_cache
+from dashboard.charts import chart_frame, shared_bar_chart
+from dashboard.diagnostics import record_frame
+from dashboard.fragments import findings
+from dashboard.metrics import frame_kpis
+from dashboard.store import get_data_store
+
+# ---------------- Category Analysis ----------------
+def category_analysis_page():
+    st.header("Campaign Category Share Analysis")
+
+    df = get_data_store().category_shares()
+    record_frame('table', df)
+    kpis = get_shared_cache().derived(df, 'category kpis', lambda df: frame_kpis(df, ["PepsiCo Campaign Category Share", "Competitor Category Share", "% Change"]))
+
+    # Chart 1
+    st.subheader("Category Share During Campaign Period by Product")
+    shared_bar_chart(df, 'category chart 1', lambda df: chart_frame(df, {
+        'PepsiCo': "PepsiCo Campaign Category Share",
+        'Competitors': "Competitor Category Share"
+    }), scale=100, other='mean')
+
+    # Chart 2
+    st.subheader("Pre-Campaign PepsiCo Share by Product")
+    shared_bar_chart(df, 'category chart 2', lambda df: chart_frame(df, {
+        'Pre-Campaign PepsiCo Share (%)': "Pre-Campaign PepsiCo"
+    }), scale=100, other='mean')
+
+    # Chart 3
+    st.subheader("Category Share Comparison by Product (Campaign vs Pre-Campaign)")
+    shared_bar_chart(df, 'category chart 3', lambda df: chart_frame(df, {
+        'PepsiCo (Campaign)': "PepsiCo Campaign Category Share",
+        'PepsiCo (Pre-Campaign)': "Pre-Campaign PepsiCo",
+        'Competitor (Campaign)': "Competitor Category Share"
+    }), scale=100, other='mean')
+
+    # Key findings
+    change = kpis["% Change"]
+    avg_pepsico_share = kpis["PepsiCo Campaign Category Share"].mean
+    avg_competitor_share = kpis["Competitor Category Share"].mean
+
+    findings("Key Findings", [
+        f"PepsiCo avg share {avg_pepsico_share:.0%}, competitors {avg_competitor_share:.0%}.",
+        f"{change.positive} products increased share, {change.negative} decreased. Largest gain: **{change.top_label}**.",
+    ])
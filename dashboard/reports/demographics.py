@@ -0,0 +1,91 @@
+import calendar
+
+import streamlit as st
+import pandas as pd
+
+from dashboard.charts import bar_chart
+from dashboard.fragments import findings
+from dashboard.shoppers import find_transactions, summarize_transactions
+from dashboard.store import AGE_ROLLUP, get_data_store
+from dashboard.workbooks import get_workbook_cache
+
+# ---------------- Demographics ----------------
+DAY_NAMES = dict(zip(calendar.day_abbr, calendar.day_name))
+
+def demographics_page():
+    st.header("Shopper Demographics")
+
+    # Volume-weighted splits from raw shopper transactions when a file is present,
+    # otherwise the per-product percentage splits in the data store
+    splits = None
+    path = find_transactions()
+    if path is not None:
+        try:
+            splits = get_workbook_cache().get(path, summarize_transactions)
+        except Exception as e:
+            st.warning(f"Could not read shopper transactions from `{path}` ({e}); showing per-product splits instead.")
+    if splits is not None and splits.volume > 0:
+        day_means, gender_means, age_means = splits.day * 100, splits.gender * 100, splits.age * 100
+        st.caption(f"Volume-weighted over {splits.records:,} shopper records ({splits.volume:,.0f} units) from `{path}`.")
+    else:
+        store = get_data_store()
+        day_means = store.demographic_split("day")
+        day_means = day_means / day_means.sum() * 100
+        gender_means = store.demographic_split("gender")
+        gender_means = gender_means / gender_means.sum() * 100
+        age_means = store.demographic_split("age", rollup=AGE_ROLLUP)
+        age_means = age_means / age_means.sum() * 100
+    days = list(day_means.index)
+    genders = list(gender_means.index)
+    age_groups = list(age_means.index)
+
+    top_day = day_means.idxmax(); top_day_pct = day_means.max()
+    low_day = day_means.idxmin(); low_day_pct = day_means.min()
+    female_pct = gender_means['Female']; male_pct = gender_means['Male']
+    top_age_group = age_means.idxmax(); top_age_pct = age_means.max()
+
+    # Plots
+    st.subheader("Shoppers by Day of Week (Average % Split)")
+    day_data = pd.DataFrame({
+        'Day': days,
+        'Share (%)': day_means.values
+    })
+    bar_chart(day_data.set_index('Day'), height=400)
+
+    st.markdown(f"**Key Findings - Day of Week:**")
+    findings(None, [
+        f"Shopper activity peaked on **{top_day}** ({top_day_pct:.1f}%) and was lowest on **{low_day}** ({low_day_pct:.1f}%).",
+        f"{DAY_NAMES.get(top_day, top_day)} had the highest activity ({top_day_pct:.1f}%).",
+    ])
+
+    st.subheader("Gender Breakdown (Average % Split)")
+    gender_data = pd.DataFrame({
+        'Gender': genders,
+        'Share (%)': gender_means.values
+    })
+    bar_chart(gender_data.set_index('Gender'), height=400)
+
+    st.markdown(f"**Key Findings - Gender:**")
+    findings(None, [
+        f"Female shoppers represented **{female_pct:.1f}%** of the total, with males at **{male_pct:.1f}%**.",
+        f"Female shoppers made up {female_pct:.1f}% of shoppers.",
+    ])
+
+    st.subheader("Age Breakdown (Average % Split)")
+    age_data = pd.DataFrame({
+        'Age Group': age_groups,
+        'Share (%)': age_means.values
+    })
+    bar_chart(age_data.set_index('Age Group'), height=400)
+
+    st.markdown(f"**Key Findings - Age:**")
+    findings(None, [
+        f"The largest age group was **{top_age_group}** ({top_age_pct:.1f}%).",
+    ])
+
+    st.markdown("### Summary Findings")
+    findings(None, [
+        "The demographic analysis reveals patterns that should inform timing, targeting, and messaging of future campaigns.",
+        f"Focus on peak shopping days like **{top_day}** for campaign launches.",
+        f"Tailor messaging to resonate with the dominant **{top_age_group}** age group.",
+    ])
@@ -0,0 +1,67 @@
+import streamlit as st
+
+from dashboard.bootstrap import lift_intervals
+from dashboard.charts import chart_frame, shared_bar_chart
+from dashboard.diagnostics import record_frame
+from dashboard.fragments import findings
+from dashboard.sources import get_data_source
+from dashboard.store import selected_campaign_id
+
+# ---------------- Prior Periods ----------------
+def prior_periods_page():
+    st.header("Campaign Prior Periods Analysis")
+    
+    # Read the workbook or database table (maintained incrementally across reruns and sessions)
+    try:
+        df, cols, kpis = get_data_source().prior_periods(selected_campaign_id())
+        col_prior, col_feb_may, col_campaign, col_increase = cols
+        record_frame('table', df)
+
+        if not (col_prior and col_feb_may and col_campaign and col_increase and 'Product Description' in df.columns):
+            st.warning("Could not detect all expected columns automatically. Please ensure the Excel file structure matches the expected layout.")
+    except FileNotFoundError:
+        st.error("File `Prior Periods.xlsx` not found in current directory.")
+        return
+    except Exception as e:
+        st.error(f"Error reading Prior Periods data: {e}")
+        return
+
+    # Metrics for both findings blocks, patched in place when the workbook changes
+    vs_avg = kpis.get('vs_avg')
+    increase = kpis.get('increase')
+
+    # Chart 1
+    st.subheader("Campaign Period Sales vs. Average of Prior Months")
+    shared_bar_chart(df, 'prior periods chart 1', lambda df: chart_frame(df, {
+        'Campaign Period Sales': col_campaign,
+        'Avg of Prior Months': 'Avg Prior Months'
+    }), sort_by='Campaign Period Sales', other='mean')
+
+    # Key findings for Chart 1
+    above_avg_count = vs_avg.positive if vs_avg else 0
+    findings("Key Findings - Campaign vs Prior Average", [
+        f"{above_avg_count} out of {len(df)} products achieved higher sales during the campaign than their prior average.",
+        "Products above average likely benefited from campaign activities.",
+        "Focus on replicating successful tactics and investigating underperformers.",
+    ])
+
+    # Chart 2: increase %
+    st.subheader("Sales Increase During Campaign vs. Avg of Prior Months")
+    shared_bar_chart(df, 'prior periods chart 2', lambda df: chart_frame(df, {
+        'Sales Increase (%)': col_increase
+    }), scale=100, keep='extremes', other='mean')
+    if col_campaign:
+        lift_intervals(df, 'prior periods', 'Avg Prior Months', col_campaign, "Portfolio change vs avg of prior months")
+
+    # Key findings
+    increase_count = increase.positive if increase else 0
+    decrease_count = increase.negative if increase else 0
+    lines = [f"{increase_count} products increased vs avg prior months, {decrease_count} decreased."]
+    if increase and increase.top_label is not None:
+        lines.append(f"Top grower vs prior average: **{increase.top_label}** (+{increase.top_value:.1%}).")
+    lines += [
+        f"{increase_count} products experienced growth, while {decrease_count} declined.",
+        "Green bars indicate positive campaign impact.",
+        "Focus on doubling down on growth products.",
+    ]
+    findings("Key Findings - Sales Increase Analysis", lines)
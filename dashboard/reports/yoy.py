@@ -0,0 +1,51 @@
+import streamlit as st
+
+from dashboard.bootstrap import lift_intervals
+from dashboard.charts import chart_frame, shared_bar_chart
+from dashboard.diagnostics import record_frame
+from dashboard.fragments import findings
+from dashboard.formatting import human_format
+from dashboard.sources import get_data_source
+from dashboard.store import selected_campaign_id
+
+# ---------------- YOY Analysis ----------------
+def yoy_analysis_page():
+    st.header("YOY Analysis")    
+
+    # Read the workbook or database table (cached across reruns and sessions)
+    source = get_data_source()
+    campaign_id = selected_campaign_id()
+    try:
+        # Metrics first: streamed in bounded memory (writing the sidecar the table
+        # is then read from) or aggregated by the database
+        summary = source.yoy_summary(campaign_id)
+        df = source.yoy_table(campaign_id)
+        record_frame('table', df)
+    except FileNotFoundError:
+        st.error("File `YOY Analysis.xlsx` not found in current directory.")
+        return
+    except Exception as e:
+        st.error(f"Error reading YOY data: {e}")
+        return
+
+    # Chart 1: YOY pct change
+    st.subheader("YOY Sales Change by Product")
+    shared_bar_chart(df, 'yoy chart 1', lambda df: chart_frame(df, {
+        'Increase (%)': 'Increase in sales from Prior Year AVE'
+    }), scale=100, keep='extremes', other='mean')
+    lift_intervals(df, 'yoy', 'QTY Sold Prior Year', 'QTY Sold CAMPAIGN PERIOD', "Portfolio change vs prior year")
+    
+    # Chart 2: Prior vs Campaign volumes
+    st.subheader("YOY Sales Comparison by Product")
+    shared_bar_chart(df, 'yoy chart 2', lambda df: chart_frame(df, {
+        'Prior Year': 'QTY Sold Prior Year',
+        'Campaign Period': 'QTY Sold CAMPAIGN PERIOD'
+    }), sort_by='Campaign Period', other='mean')
+
+    # Key insights display
+    lines = [f"{summary.increase_count} products increased, {summary.decrease_count} decreased; average change {summary.avg_increase:.2%}."]
+    if summary.top_grower is not None:
+        lines.append(f"Top grower: **{summary.top_grower[0]}** ({summary.top_grower[1]:.2%}).")
+        lines.append(f"Top decliner: **{summary.top_decliner[0]}** ({summary.top_decliner[1]:.2%}).")
+    lines.append(f"Total prior: {human_format(summary.total_prior)} → Total campaign: {human_format(summary.total_campaign)} ({summary.total_growth:.2%}).")
+    findings("Key Findings", lines)
@@ -0,0 +1,198 @@
+import functools
+import os
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+
+import pandas as pd
+
+from dashboard.diagnostics import span
+
+# ---------------- Workbook Schemas ----------------
+# Each incoming layout is declared once as fields with header aliases. The
+# aliases are compiled into one regex per field and searched in headers that
+# are lowercased with whitespace collapsed, so a dated header such as
+# 'QTY Sold Prior Year\n14 May 2024 to 14 Aug 2024' still matches. Fields
+# claim headers in declared order, and each takes the first header that no
+# earlier field took. Resolution needs only the header row. The mapping is
+# cached per header and per workbook fingerprint (path, mtime, size), and
+# loaders then read just the mapped columns with the declared dtypes. A
+# layout without a required field fails before any data row is parsed.
+Field = namedtuple('Field', 'name aliases dtype required')
+
+class SchemaError(ValueError):
+    pass
+
+class Schema:
+    def __init__(self, name, fields, header_row=1):
+        self.name = name
+        self.fields = fields
+        # Zero-based, as pandas' header=
+        self.header_row = header_row
+        self.patterns = [re.compile('|'.join(f'(?:{alias})' for alias in f.aliases)) for f in fields]
+
+    def resolve(self, header, source=None):
+        layout = _match(self, tuple(header))
+        missing = [f.name for f in self.fields if f.required and layout.positions[f.name] is None]
+        if missing:
+            raise SchemaError(f"{source or self.name}: no column for {', '.join(map(repr, missing))} "
+                              f"in header {list(header)}")
+        return layout
+
+class Layout(namedtuple('Layout', 'schema header positions')):
+    # positions: field name -> position in header, or None when absent
+    __slots__ = ()
+
+    def column(self, name):
+        position = self.positions[name]
+        return None if position is None else self.header[position]
+
+    def columns(self, names):
+        return [self.column(name) for name in names]
+
+    @property
+    def usecols(self):
+        return sorted(p for p in self.positions.values() if p is not None)
+
+def _normalize(header):
+    return ' '.join(str(header).split()).lower()
+
+@functools.lru_cache(maxsize=256)
+def _match(schema, header):
+    with span('detect'):
+        normalized = [_normalize(h) for h in header]
+        taken, positions = set(), {}
+        for field, pattern in zip(schema.fields, schema.patterns):
+            position = next((i for i, h in enumerate(normalized) if i not in taken and pattern.search(h)), None)
+            if position is not None:
+                taken.add(position)
+            positions[field.name] = position
+    return Layout(schema, header, positions)
+
+# ---------------- Header Reads ----------------
+# Opening a large workbook through openpyxl, even read-only, loads its whole
+# shared-strings table first. The header is instead streamed out of the sheet
+# XML, stopping after the header row, and only the shared strings it refers
+# to are looked up, again stopping once the last one is found.
+_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_REL_ID = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+
+def _sheet_part(book, sheet):
+    rid = ET.fromstring(book.read('xl/workbook.xml')).find(f'{_NS}sheets')[sheet].get(_REL_ID)
+    rels = ET.fromstring(book.read('xl/_rels/workbook.xml.rels'))
+    target = next(r.get('Target') for r in rels if r.get('Id') == rid)
+    return target[1:] if target.startswith('/') else f'xl/{target}'
+
+def _column_index(ref):
+    index = 0
+    for ch in ref:
+        if not ch.isalpha():
+            break
+        index = index * 26 + ord(ch.upper()) - 64
+    return index - 1
+
+def _text(element):
+    return ''.join(t.text or '' for t in element.iter(f'{_NS}t'))
+
+def _shared_strings(book, wanted):
+    # {index: text} for the wanted indices of the shared-strings table
+    found, last = {}, max(wanted, default=-1)
+    if last < 0:
+        return found
+    with book.open('xl/sharedStrings.xml') as f:
+        index = 0
+        for _, element in ET.iterparse(f):
+            if element.tag != f'{_NS}si':
+                continue
+            if index in wanted:
+                found[index] = _text(element)
+            if index == last:
+                break
+            index += 1
+            element.clear()
+    return found
+
+def _xlsx_header(path, row, sheet):
+    # Cell values of one zero-based row as strings, None for blanks
+    cells, shared = {}, {}
+    with zipfile.ZipFile(path) as book:
+        with book.open(_sheet_part(book, sheet)) as f:
+            number = 0
+            for _, element in ET.iterparse(f):
+                if element.tag != f'{_NS}row':
+                    continue
+                # Row and cell references are optional; without them, position counts
+                number = int(element.get('r') or number + 1)
+                if number > row + 1:
+                    break
+                if number == row + 1:
+                    column = -1
+                    for c in element.iter(f'{_NS}c'):
+                        column = _column_index(c.get('r')) if c.get('r') else column + 1
+                        kind, value = c.get('t'), c.find(f'{_NS}v')
+                        if kind == 'inlineStr':
+                            cells[column] = _text(c)
+                        elif value is not None and kind == 's':
+                            shared[column] = int(value.text)
+                        elif value is not None:
+                            cells[column] = value.text
+                    break
+                element.clear()
+        strings = _shared_strings(book, set(shared.values()))
+    cells.update((column, strings.get(index)) for column, index in shared.items())
+    return [cells.get(i) for i in range(max(cells, default=-1) + 1)]
+
+def read_header(path, row, sheet=0):
+    # One row, stripped like the loaders strip it
+    with span('read'):
+        try:
+            cells = _xlsx_header(path, row, sheet)
+        except (KeyError, IndexError, StopIteration, ValueError, TypeError, ET.ParseError, zipfile.BadZipFile):
+            # Not an xlsx package this reader understands: let openpyxl find the row
+            import openpyxl
+
+            wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+            try:
+                cells = next(wb.worksheets[sheet].iter_rows(min_row=row + 1, max_row=row + 1, values_only=True), ())
+            finally:
+                wb.close()
+    return tuple('' if c is None else str(c).strip() for c in cells)
+
+@functools.lru_cache(maxsize=64)
+def _workbook_layout(schema, path, mtime_ns, size):
+    return schema.resolve(read_header(path, schema.header_row), source=os.path.basename(path))
+
+def workbook_layout(schema, path):
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    return _workbook_layout(schema, path, stat.st_mtime_ns, stat.st_size)
+
+def cast_columns(df, layout):
+    # Declared dtypes for the mapped columns present in df; unparseable numbers
+    # become NaN. Columns already read as numbers are converted directly, and
+    # only those holding text go through to_numeric.
+    for field in layout.schema.fields:
+        column = layout.column(field.name)
+        if column not in df.columns or df[column].dtype == field.dtype:
+            continue
+        if field.dtype == object:
+            df[column] = df[column].astype(object)
+        elif pd.api.types.is_numeric_dtype(df[column]) and not pd.api.types.is_bool_dtype(df[column]):
+            df[column] = df[column].astype(field.dtype)
+        else:
+            df[column] = pd.to_numeric(df[column], errors='coerce').astype(field.dtype)
+    return df
+
+def read_columns(path, schema):
+    # (mapped columns of the first sheet under their stripped headers, layout)
+    layout = workbook_layout(schema, path)
+    usecols = layout.usecols
+    # Cells are parsed with inferred types and only columns that don't already
+    # have the declared dtype are cast afterwards; reading as object would box
+    # every cell and send every column through to_numeric
+    with span('read'):
+        df = pd.read_excel(path, sheet_name=0, header=schema.header_row, usecols=usecols)
+    with span('clean'):
+        df.columns = [layout.header[p] for p in usecols]
+        return cast_columns(df, layout), layout
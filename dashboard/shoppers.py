@@ -0,0 +1,145 @@
+import csv
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from dashboard.diagnostics import span
+
+# ---------------- Shopper Transactions ----------------
+# Raw shopper records (timestamp, gender, age, product and an optional
+# quantity) are read from CSV or Parquet as Arrow record batches and folded
+# into fixed-size histograms with np.bincount, so memory is bounded by one
+# batch however long the file is. Each record is weighted by its quantity (1
+# when the file has no quantity column or the record leaves it blank), which
+# makes the splits volume weighted rather than a plain mean over products.
+# Days of week are taken on the timestamps' own wall clock: local time for
+# zoned timestamps, as written for naive ones. Records whose timestamp is
+# blank or unreadable still count toward the gender and age splits.
+TRANSACTION_FILES = ('Shopper Transactions.parquet', 'Shopper Transactions.csv')
+TRANSACTION_COLUMNS = ('timestamp', 'gender', 'age')
+TRANSACTION_BATCH_ROWS = 1_000_000
+CSV_BLOCK_BYTES = 64 * 1024 ** 2
+
+DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+GENDERS = ['Female', 'Male']
+# Lower edge of each band; matches the page's rolled-up store buckets
+AGE_EDGES = [0, 25, 35, 45, 55, 65]
+AGE_BANDS = ['0-24', '25-34', '35-44', '45-54', '55-64', '65+']
+MAX_AGE = 120
+ISO_TIMESTAMP = r'^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:[.,]\d+)?)?)?\s*(?:Z|[+-]\d{2}(?::?\d{2})?)?$'
+
+# day / gender / age: share of volume per bucket (sums to 1)
+ShopperSplits = namedtuple('ShopperSplits', 'day gender age records volume')
+
+def find_transactions():
+    return next((path for path in TRANSACTION_FILES if os.path.exists(path)), None)
+
+def _csv_header(path):
+    with open(path, newline='') as f:
+        return [c.strip() for c in next(csv.reader(f), [])]
+
+def iter_transaction_batches(path, batch_rows=TRANSACTION_BATCH_ROWS):
+    import pyarrow as pa
+
+    if path.lower().endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path, memory_map=True, read_dictionary=['gender'])
+        names = parquet.schema_arrow.names
+    else:
+        import pyarrow.csv as pv
+
+        names = _csv_header(path)
+    missing = [c for c in TRANSACTION_COLUMNS if c not in names]
+    if missing:
+        raise ValueError(f"Shopper transactions file is missing column(s): {', '.join(missing)}")
+    columns = [*TRANSACTION_COLUMNS, *(['quantity'] if 'quantity' in names else [])]
+
+    if path.lower().endswith('.parquet'):
+        yield from parquet.iter_batches(batch_size=batch_rows, columns=columns)
+    else:
+        # Timestamps stay text: Arrow's parser would move offset timestamps to UTC
+        types = {'timestamp': pa.string(), 'gender': pa.dictionary(pa.int32(), pa.string()),
+                 'age': pa.float64(), 'quantity': pa.float64()}
+        yield from pv.open_csv(path, read_options=pv.ReadOptions(block_size=CSV_BLOCK_BYTES),
+                               convert_options=pv.ConvertOptions(include_columns=columns, strings_can_be_null=True,
+                                                                 column_types={c: types[c] for c in columns if c in types}))
+
+def _numeric(column, fill):
+    # Arrow column -> float64 ndarray, nulls replaced by fill
+    values = column.to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+    if column.null_count:
+        values = np.where(column.is_valid().to_numpy(zero_copy_only=False), values, fill)
+    return values
+
+def _gender_codes(column):
+    # Index into GENDERS by initial (F/M), -1 otherwise. String work runs on
+    # the dictionary only, so it costs the number of distinct spellings.
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if not pa.types.is_dictionary(column.type):
+        column = pc.dictionary_encode(column)
+    initials = pc.utf8_upper(pc.utf8_slice_codeunits(pc.utf8_trim_whitespace(pc.cast(column.dictionary, pa.string())), 0, 1))
+    lookup = pc.fill_null(pc.index_in(initials, value_set=pa.array([g[0] for g in GENDERS])), -1).to_numpy(zero_copy_only=False)
+    indices = pc.fill_null(column.indices, 0).to_numpy(zero_copy_only=False)
+    codes = lookup[indices] if len(lookup) else np.full(len(column), -1)
+    if column.null_count:
+        codes[~column.is_valid().to_numpy(zero_copy_only=False)] = -1
+    return codes
+
+def _histograms(batch):
+    # Volume per day of week, gender and age band for one record batch, plus its total
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    names = batch.schema.names
+    weights = _numeric(batch.column('quantity'), 1) if 'quantity' in names else np.ones(batch.num_rows)
+
+    stamps = batch.column('timestamp')
+    if pa.types.is_string(stamps.type) or pa.types.is_large_string(stamps.type):
+        # ISO 8601 text: the date as written is the wall-clock date whatever the
+        # UTC offset. Values that aren't ISO 8601 become null, like blanks.
+        dates = pc.if_else(pc.match_substring_regex(stamps, ISO_TIMESTAMP),
+                           pc.utf8_slice_codeunits(stamps, 0, 10), pa.scalar(None, stamps.type))
+        stamps = pc.strptime(dates, '%Y-%m-%d', 's', error_is_null=True)
+    elif not (pa.types.is_timestamp(stamps.type) or pa.types.is_date(stamps.type)):
+        stamps = pc.cast(stamps, pa.timestamp('s'))
+    # Monday is 0
+    days = pc.day_of_week(stamps)
+    valid = days.is_valid().to_numpy(zero_copy_only=False)
+    days = pc.fill_null(days, 0).to_numpy(zero_copy_only=False)
+    day = np.bincount(days[valid], weights[valid], minlength=len(DAYS))
+
+    codes = _gender_codes(batch.column('gender'))
+    valid = codes >= 0
+    gender = np.bincount(codes[valid], weights[valid], minlength=len(GENDERS))
+
+    # Histogram by whole year of age, then summed into bands
+    ages = _numeric(batch.column('age'), np.nan)
+    valid = ages >= 0
+    years = np.minimum(ages[valid], MAX_AGE).astype(np.intp)
+    age = np.add.reduceat(np.bincount(years, weights[valid], minlength=MAX_AGE + 1), AGE_EDGES)
+    return day, gender, age, weights.sum()
+
+def _shares(totals, labels):
+    total = totals.sum()
+    return pd.Series(totals / total if total else np.full(len(labels), np.nan), index=pd.Index(labels, name='bucket'))
+
+def summarize_transactions(path, batch_rows=TRANSACTION_BATCH_ROWS):
+    day, gender, age = np.zeros(len(DAYS)), np.zeros(len(GENDERS)), np.zeros(len(AGE_BANDS))
+    records = 0
+    volume = 0.0
+    # Batch reads are charged to 'read', the histograms to 'compute'
+    with span('read'):
+        for batch in iter_transaction_batches(path, batch_rows):
+            with span('compute'):
+                d, g, a, v = _histograms(batch)
+                day += d
+                gender += g
+                age += a
+                records += batch.num_rows
+                volume += float(v)
+    return ShopperSplits(_shares(day, DAYS), _shares(gender, GENDERS), _shares(age, AGE_BANDS), records, volume)
@@ -0,0 +1,296 @@
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import quote, urlsplit
+
+import streamlit as st
+
+from dashboard.diagnostics import span
+from dashboard.frames import compact_frame
+from dashboard.incremental import cached_pipeline, get_prior_periods_pipeline
+from dashboard.metrics import Kpi
+from dashboard.workbooks import (YOY_COLUMNS, YOY_SCHEMA, YoyAggregates, detect_prior_periods_columns, get_workbook_cache,
+                                 load_yoy_workbook, summarize_yoy_workbook)
+
+# ---------------- Data Sources ----------------
+# The YOY and Prior Periods pages read through a data source: by default the
+# two workbooks in the working directory, or, with DASHBOARD_SOURCE set to a
+# database URL (e.g. sqlite:///sales.db), the yoy_analysis and prior_periods
+# tables, whose columns are named like the workbook headers. SQL sources run
+# parameterized queries that filter rows (products, and the selected
+# campaign when the table has a campaign_id column) and compute the YOY Key
+# Findings aggregates in the database, fetch tables in chunks, and borrow
+# connections from a bounded pool. Results are reused for
+# DASHBOARD_SOURCE_TTL seconds.
+SOURCE_URL = os.environ.get('DASHBOARD_SOURCE', '')
+SOURCE_TTL = float(os.environ.get('DASHBOARD_SOURCE_TTL', 60))
+POOL_SIZE = int(os.environ.get('DASHBOARD_SOURCE_POOL', 4))
+POOL_TIMEOUT = 30
+FETCH_ROWS = 50_000
+
+YOY_WORKBOOK = 'YOY Analysis.xlsx'
+PRIOR_PERIODS_WORKBOOK = 'Prior Periods.xlsx'
+YOY_TABLE = 'yoy_analysis'
+PRIOR_PERIODS_TABLE = 'prior_periods'
+CAMPAIGN_COLUMN = 'campaign_id'
+KEY = 'Product Description'
+
+class WorkbookSource:
+    # One workbook per table, so campaign_id is ignored
+    def __init__(self, cache, pipeline):
+        self._cache = cache
+        self._pipeline = pipeline
+
+    def yoy_table(self, campaign_id=None):
+        return self._cache.get(YOY_WORKBOOK, load_yoy_workbook)
+
+    def yoy_summary(self, campaign_id=None):
+        return self._cache.get(YOY_WORKBOOK, summarize_yoy_workbook)
+
+    def prior_periods(self, campaign_id=None):
+        # (table, detected columns, KPIs), maintained incrementally
+        self._pipeline.refresh()
+        return self._pipeline.snapshot()
+
+# ---------------- SQL Backends ----------------
+# URL scheme -> (connect(url), DB-API paramstyle, row order). Queries are
+# written with qmark placeholders; 'format' drivers (e.g. psycopg) get them as
+# %s. row_order is an expression in table order (SQLite's rowid), used to
+# break ties the way the workbook loaders do: first row wins. Backends
+# without one break ties on the product key.
+BACKENDS = {}
+
+def register_backend(scheme, connect, paramstyle='qmark', row_order=None):
+    BACKENDS[scheme] = (connect, paramstyle, row_order)
+
+def _sqlite_path(url):
+    # sqlite:///relative.db or sqlite:////absolute.db
+    return urlsplit(url).path[1:]
+
+def _connect_sqlite(url):
+    import sqlite3
+
+    # Read-only; the pool hands a connection to one thread at a time
+    return sqlite3.connect(f'file:{quote(_sqlite_path(url))}?mode=ro', uri=True, check_same_thread=False)
+
+register_backend('sqlite', _connect_sqlite, row_order='rowid')
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+def _format_params(sql):
+    # ? -> %s outside quoted identifiers; literal % doubled
+    parts = re.split(r'("(?:[^"]|"")*")', sql)
+    return ''.join(p if i % 2 else p.replace('%', '%%').replace('?', '%s') for i, p in enumerate(parts))
+
+class ConnectionPool:
+    # At most size connections, opened on demand; callers wait for a free one
+    def __init__(self, connect, size=POOL_SIZE, timeout=POOL_TIMEOUT):
+        self._connect = connect
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.size = size
+        self.timeout = timeout
+
+    @contextmanager
+    def connection(self):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"No database connection free after {self.timeout:.0f} s")
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                yield conn
+                # End the read transaction so the next borrower sees fresh data
+                conn.rollback()
+            except BaseException:
+                conn.close()
+                raise
+            self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+class SqlSource:
+    def __init__(self, url, cache, pool_size=POOL_SIZE, ttl=SOURCE_TTL):
+        scheme = urlsplit(url).scheme.split('+')[0]
+        if scheme not in BACKENDS:
+            raise ValueError(f"No data source backend for '{scheme}' URLs")
+        connect, self.paramstyle, self.row_order = BACKENDS[scheme]
+        self.url = url
+        self.ttl = ttl
+        self.pool = ConnectionPool(lambda: connect(url), pool_size)
+        self._cache = cache
+
+    def stamp(self):
+        # Changes every ttl seconds; cached results are keyed on it
+        return int(time.time() // self.ttl) if self.ttl > 0 else time.monotonic_ns()
+
+    def _cached(self, name, build):
+        return self._cache.load((self.url, name, self.stamp()), build)
+
+    def _execute(self, conn, sql, params=()):
+        if self.paramstyle == 'format':
+            sql = _format_params(sql)
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        return cursor
+
+    def fetch_rows(self, sql, params=()):
+        with self.pool.connection() as conn, span('read'):
+            return self._execute(conn, sql, params).fetchall()
+
+    def fetch_frame(self, sql, params=()):
+        # Fetched FETCH_ROWS at a time, so the driver's row buffer stays bounded
+        import pandas as pd
+
+        chunks = []
+        with self.pool.connection() as conn, span('read'):
+            cursor = self._execute(conn, sql, params)
+            names = [d[0] for d in cursor.description]
+            while True:
+                rows = cursor.fetchmany(FETCH_ROWS)
+                if not rows:
+                    break
+                chunks.append(pd.DataFrame.from_records(rows, columns=names))
+        return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=names)
+
+    def columns(self, table):
+        def build():
+            with self.pool.connection() as conn, span('read'):
+                return [d[0] for d in self._execute(conn, f"SELECT * FROM {_quote(table)} WHERE 1 = 0").description]
+        return self._cached(('columns', table), build)
+
+    def _where(self, table, key, campaign_id):
+        # Rows with a product, and of the selected campaign where the table has several
+        clause, params = f"WHERE {_quote(key)} IS NOT NULL", []
+        if campaign_id is not None and CAMPAIGN_COLUMN in self.columns(table):
+            clause += f" AND {_quote(CAMPAIGN_COLUMN)} = ?"
+            params.append(campaign_id)
+        return clause, params
+
+    def _yoy_columns(self):
+        # Table columns for YOY_COLUMNS, matched like the workbook headers
+        columns = [c for c in self.columns(YOY_TABLE) if c != CAMPAIGN_COLUMN]
+        return YOY_SCHEMA.resolve(columns, source=YOY_TABLE).columns(YOY_COLUMNS)
+
+    def yoy_table(self, campaign_id=None):
+        def build():
+            columns = self._yoy_columns()
+            where, params = self._where(YOY_TABLE, columns[0], campaign_id)
+            select = ', '.join(f"{_quote(c)} AS {_quote(name)}" for c, name in zip(columns, YOY_COLUMNS))
+            return compact_frame(self.fetch_frame(f"SELECT {select} FROM {_quote(YOY_TABLE)} {where}", params))
+        return self._cached(('yoy table', campaign_id), build)
+
+    def yoy_summary(self, campaign_id=None):
+        return self._cached(('yoy summary', campaign_id), lambda: self._yoy_summary(campaign_id))
+
+    def _yoy_summary(self, campaign_id):
+        # Counts and totals in one aggregate query, each extremum as a one-row query
+        columns = self._yoy_columns()
+        key, table = _quote(columns[0]), _quote(YOY_TABLE)
+        where, params = self._where(YOY_TABLE, columns[0], campaign_id)
+        metrics = [_quote(c) for c in columns[1:]]
+        aggregates = ', '.join(f"COUNT({m}), SUM({m}), SUM(CASE WHEN {m} > 0 THEN 1 ELSE 0 END), "
+                               f"SUM(CASE WHEN {m} < 0 THEN 1 ELSE 0 END)" for m in metrics)
+        row = self.fetch_rows(f"SELECT COUNT(*), {aggregates} FROM {table} {where}", params)[0]
+
+        tiebreak = self.row_order or key
+        summary = YoyAggregates()
+        summary.rows = row[0]
+        summary.kpis = {}
+        for i, (name, metric) in enumerate(zip(YOY_COLUMNS[1:], metrics)):
+            count, total, positive, negative = row[1 + 4 * i:5 + 4 * i]
+            extremes = []
+            for order in ('DESC', 'ASC'):
+                found = self.fetch_rows(f"SELECT {key}, {metric} FROM {table} {where} AND {metric} IS NOT NULL "
+                                        f"ORDER BY {metric} {order}, {tiebreak} ASC LIMIT 1", params) if count else []
+                extremes += [found[0][0], float(found[0][1])] if found else [None, float('nan')]
+            summary.kpis[name] = Kpi(positive or 0, negative or 0, count, float(total or 0), *extremes)
+        return summary
+
+    def prior_periods_frame(self, campaign_id=None):
+        # The table as read_prior_periods_excel leaves it, with the prior average computed in the database
+        columns = [c for c in self.columns(PRIOR_PERIODS_TABLE) if c != CAMPAIGN_COLUMN]
+        col_prior, col_feb_may, _, _ = detect_prior_periods_columns(columns)
+        if col_prior and col_feb_may:
+            a, b = _quote(col_prior), _quote(col_feb_may)
+            average = f"CASE WHEN {a} IS NULL THEN {b} WHEN {b} IS NULL THEN {a} ELSE ({a} + {b}) / 2.0 END"
+        else:
+            average = "NULL"
+        where, params = self._where(PRIOR_PERIODS_TABLE, KEY, campaign_id)
+        select = ', '.join(map(_quote, columns))
+        df = self.fetch_frame(f"SELECT {select}, {average} AS {_quote('Avg Prior Months')} "
+                              f"FROM {_quote(PRIOR_PERIODS_TABLE)} {where}", params)
+        return df.astype({'Avg Prior Months': 'float64'})
+
+    def prior_periods(self, campaign_id=None):
+        # One incremental pipeline per campaign, refreshed once per ttl and held
+        # in the shared cache under its byte budget
+        pipeline = cached_pipeline(self._cache.shared, ('pipeline', self.url, PRIOR_PERIODS_TABLE, campaign_id),
+                                   f'{self.url} {PRIOR_PERIODS_TABLE}',
+                                   load=lambda: self.prior_periods_frame(campaign_id), stamp=self.stamp)
+        pipeline.refresh()
+        return pipeline.snapshot()
+
+def resolve_url(url):
+    # SQLite paths are resolved against the working directory, like the workbooks
+    if urlsplit(url).scheme == 'sqlite':
+        return 'sqlite:///' + os.path.abspath(_sqlite_path(url))
+    return url
+
+@st.cache_resource
+def _open_sql_source(url):
+    return SqlSource(url, get_workbook_cache())
+
+def get_data_source():
+    if SOURCE_URL:
+        return _open_sql_source(resolve_url(SOURCE_URL))
+    return WorkbookSource(get_workbook_cache(), get_prior_periods_pipeline(PRIOR_PERIODS_WORKBOOK))
+
+# Report pages -> the table they read
+PAGE_TABLES = {'YOY Analysis': YOY_TABLE, 'Prior Periods': PRIOR_PERIODS_TABLE}
+
+def campaign_scoped(page):
+    # Whether the campaign selector filters page's data: only database tables
+    # with a campaign_id column do; a workbook holds one campaign
+    if not SOURCE_URL or page not in PAGE_TABLES:
+        return False
+    try:
+        return CAMPAIGN_COLUMN in get_data_source().columns(PAGE_TABLES[page])
+    except Exception:
+        # Unreachable database: the page reports it when it reads
+        return False
+
+# ---------------- SQLite Copy ----------------
+# For trying the SQL source: copies the workbooks in a directory into a
+# SQLite database with the tables and columns it expects.
+#   python -m dashboard.sources sales.db [directory]
+def workbooks_to_sqlite(db_path, directory='.'):
+    import sqlite3
+
+    from dashboard.workbooks import read_prior_periods_excel, read_yoy_excel
+
+    yoy = read_yoy_excel(os.path.join(directory, YOY_WORKBOOK))
+    prior = read_prior_periods_excel(os.path.join(directory, PRIOR_PERIODS_WORKBOOK)).drop(columns='Avg Prior Months')
+    with sqlite3.connect(db_path) as conn:
+        yoy.to_sql(YOY_TABLE, conn, if_exists='replace', index=False)
+        prior.to_sql(PRIOR_PERIODS_TABLE, conn, if_exists='replace', index=False)
+    conn.close()
+    return len(yoy), len(prior)
+
+if __name__ == '__main__':
+    yoy_rows, prior_rows = workbooks_to_sqlite(*sys.argv[1:3])
+    print(f"{sys.argv[1]}: {yoy_rows} {YOY_TABLE} rows, {prior_rows} {PRIOR_PERIODS_TABLE} rows")
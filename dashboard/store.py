@@ -0,0 +1,459 @@
+import os
+import sqlite3
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import date
+
+import streamlit as st
+
+from dashboard.cache import SharedCache, get_shared_cache
+from dashboard.diagnostics import span
+
+# ---------------- Data Store ----------------
+# Share, unit, sales and demographic facts live in a local SQLite file,
+# normalized by product and period, so pages query only what they chart.
+# pandas is imported on first query so the entry point can list campaigns
+# without paying for it.
+DATA_STORE_PATH = 'dashboard.sqlite'
+STORE_VERSION = 2
+
+# Weekly product sales are the raw facts. sales_facts is the rollup layer:
+# per campaign, period (pre / campaign / post) and product it holds weekly
+# average units and sales, so switching campaigns is an indexed lookup.
+STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS campaigns (
+    campaign_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    pre_weeks INTEGER NOT NULL,
+    post_weeks INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS weekly_sales (
+    product_id INTEGER NOT NULL REFERENCES products (product_id),
+    week_start TEXT NOT NULL,
+    units NUMERIC,
+    sales NUMERIC,
+    PRIMARY KEY (product_id, week_start)
+);
+CREATE TABLE IF NOT EXISTS products (
+    product_id INTEGER PRIMARY KEY,
+    description TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS share_facts (
+    product_id INTEGER NOT NULL REFERENCES products (product_id),
+    period TEXT NOT NULL,
+    pepsico_share REAL,
+    competitor_share REAL,
+    share_change REAL,
+    PRIMARY KEY (period, product_id)
+);
+CREATE TABLE IF NOT EXISTS sales_facts (
+    campaign_id INTEGER NOT NULL REFERENCES campaigns (campaign_id),
+    product_id INTEGER NOT NULL REFERENCES products (product_id),
+    period TEXT NOT NULL,
+    units NUMERIC,
+    sales NUMERIC,
+    campaign_vs_units REAL,
+    campaign_vs_sales REAL,
+    PRIMARY KEY (campaign_id, period, product_id)
+);
+CREATE TABLE IF NOT EXISTS demographic_facts (
+    product_id INTEGER NOT NULL REFERENCES products (product_id),
+    dimension TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    bucket_order INTEGER NOT NULL,
+    share REAL,
+    PRIMARY KEY (dimension, bucket, product_id)
+);
+CREATE INDEX IF NOT EXISTS share_facts_product ON share_facts (product_id);
+CREATE INDEX IF NOT EXISTS sales_facts_product ON sales_facts (product_id);
+CREATE INDEX IF NOT EXISTS demographic_facts_product ON demographic_facts (product_id);
+CREATE INDEX IF NOT EXISTS weekly_sales_week ON weekly_sales (week_start);
+"""
+
+# Each campaign's pre / campaign / post windows: first and last week start and
+# the number of weeks weekly averages are taken over
+PERIOD_WINDOWS = """
+    SELECT campaign_id, 'pre' AS period,
+           date(start_date, '-' || (7 * pre_weeks) || ' days') AS lo,
+           date(start_date, '-1 days') AS hi, pre_weeks AS weeks
+    FROM campaigns
+    UNION ALL
+    SELECT campaign_id, 'campaign', start_date, end_date,
+           MAX(1, ROUND((julianday(end_date) - julianday(start_date) + 1) / 7.0))
+    FROM campaigns
+    UNION ALL
+    SELECT campaign_id, 'post', date(end_date, '+1 days'),
+           date(end_date, '+' || (7 * post_weeks) || ' days'), post_weeks
+    FROM campaigns
+"""
+
+Campaign = namedtuple('Campaign', 'campaign_id name start_date end_date pre_weeks post_weeks')
+
+def format_window(campaign):
+    # e.g. "14 May 2025 to 14 August 2025"
+    start, end = date.fromisoformat(campaign.start_date), date.fromisoformat(campaign.end_date)
+    return f"{start.day} {start:%B %Y} to {end.day} {end:%B %Y}"
+
+SEED_CAMPAIGN = ("May-Aug 2025", "2025-05-14", "2025-08-14", 6, 6)
+
+SEED_PRODUCTS = [
+    "BOKOMO CORN FLAKES CEREALS ORIGINAL 1KG",
+    "BOKOMO TRADITIONAL OATS 1KG",
+    "LIQUI FRUIT 2L",
+    "SIMBA CHIPS 120G",
+    "WEET BIX CEREALS BOX 450G",
+    "WEET BIX CEREALS BOX 900G",
+    "WELLINGTONS SWEET CHILLI SAUCE 700ML",
+    "WELLINGTONS TOMATO SAUCE 700ml",
+    "WHITE STAR INSTANT MAIZE PORRIDGE 1KG",
+    "WHITE STAR SUPER MAIZE MEAL MAIZE BAG 2.5KG",
+    "WHITE STAR M/MEAL 10KG"
+]
+
+# Values are listed in SEED_PRODUCTS order.
+# share_change and pre-period campaign_vs_* hold the campaign's % change over
+# that period; post-period campaign_vs_* hold the post period's % change from
+# the campaign.
+SEED_SHARE_FACTS = {
+    "campaign": {
+        "pepsico_share": [0.80, 0.14, 0.82, 0.74, 0.79, 0.83, 0.62, 0.45, 0.33, 0.09, 0.06],
+        "competitor_share": [0.20, 0.86, 0.18, 0.26, 0.21, 0.17, 0.38, 0.55, 0.67, 0.91, 0.94],
+    },
+    "pre_campaign": {
+        "pepsico_share": [0.76, 0.10, 0.85, 0.73, 0.77, 0.80, 0.69, 0.47, 0.30, 0.12, 0.07],
+        "share_change": [0.05, 0.04, -0.03, 0.01, 0.02, 0.02, -0.06, -0.02, 0.03, -0.03, -0.01],
+    },
+}
+
+SEED_SALES_FACTS = {
+    "pre": {
+        "units": [41134, 1116, 43481, 139366, 16784, 21149, 1091, 6336, 34407, 1168, 9259],
+        "sales": [
+            2146039.02, 40101.00, 1959100.98, 2458327.73, 486957.01, 1119207.82,
+            53829.88, 194247.98, 993367.85, 49663.65, 1215487.70
+        ],
+        "campaign_vs_units": [0.16, 0.92, 0.23, 0.10, 0.23, 0.0003, 0.32, 0.26, 0.06, 0.21, 0.02],
+        "campaign_vs_sales": [0.17, 1.02, 0.23, 0.10, 0.22, 0.01, 0.34, 0.33, 0.06, 0.21, -0.05],
+    },
+    "campaign": {
+        "units": [47657, 2146, 53466, 153274, 20570, 21155, 1445, 8003, 36302, 1412, 9409],
+        "sales": [
+            2512772.12, 81147.63, 2403505.63, 2695830.06, 595658.98, 1127400.03,
+            72150.90, 258569.12, 1051719.19, 59890.38, 1154819.48
+        ],
+    },
+    "post": {
+        "units": [37502, 2115, 44185, 113034, 18148, 17783, 849, 4889, 30976, 1084, 7371],
+        "sales": [
+            1910801.08, 76227.17, 2006715.47, 2047509.76, 511282.47, 959973.53,
+            44785.86, 163818.96, 882593.02, 44569.48, 852939.35
+        ],
+        "campaign_vs_units": [-0.21, -0.01, -0.17, -0.26, -0.12, -0.16, -0.41, -0.39, -0.15, -0.23, -0.22],
+        "campaign_vs_sales": [-0.24, -0.06, -0.17, -0.24, -0.14, -0.15, -0.38, -0.37, -0.16, -0.26, -0.26],
+    },
+}
+
+SEED_DEMOGRAPHIC_FACTS = {
+    "day": {
+        "Mon": [10,12,8,9,12,11,8,10,12,16,9],
+        "Tue": [14,13,12,14,15,15,14,15,15,16,17],
+        "Wed": [13,14,12,11,12,12,11,10,13,10,16],
+        "Thu": [18,19,15,14,15,16,14,13,17,12,14],
+        "Fri": [22,16,22,18,20,20,17,16,21,17,18],
+        "Sat": [18,14,18,18,17,17,18,21,18,16,17],
+        "Sun": [4,13,12,16,8,9,18,16,5,12,9],
+    },
+    "gender": {
+        "Female": [84,79,66,60,76,74,64,68,79,62,57],
+        "Male": [16,21,34,40,24,26,36,32,21,38,43],
+    },
+    "age": {
+        "0-18": [4,5,7,6,4,6,8,9,2,6,5],
+        "18-24": [6,6,3,5,6,3,3,3,7,6,5],
+        "25-34": [30,17,18,23,28,20,16,17,32,22,18],
+        "35-44": [32,40,31,30,32,33,33,35,33,26,35],
+        "45-54": [17,18,25,23,18,23,24,20,16,25,23],
+        "55-64": [6,8,10,9,8,11,10,9,7,9,10],
+        "65+": [4,6,6,4,4,5,6,6,2,7,5],
+    },
+}
+
+class DataStore:
+    def __init__(self, path=DATA_STORE_PATH, seed=True, shared=None):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._shared = shared if shared is not None else SharedCache()
+        self._depth = 0
+        # Migration, schema, version and seed commit together or not at all
+        with self._write():
+            self._migrate()
+            self._conn.execute(f"PRAGMA user_version = {STORE_VERSION}")
+            if seed and self._conn.execute("SELECT COUNT(*) FROM products").fetchone()[0] == 0:
+                self._load_seed()
+
+    def _migrate(self):
+        # Brings the schema up to date inside the caller's transaction. Version 1
+        # stores held a single campaign: their sales facts are keyed to the seed
+        # campaign. A sales_facts_v1 left by a migration that did not finish
+        # before this one was made atomic is folded in the same way.
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(sales_facts)")]
+        if (self._conn.execute("PRAGMA user_version").fetchone()[0] < STORE_VERSION
+                and columns and "campaign_id" not in columns):
+            self._conn.execute("ALTER TABLE sales_facts RENAME TO sales_facts_v1")
+            self._conn.execute("DROP INDEX IF EXISTS sales_facts_product")
+        for statement in STORE_SCHEMA.split(";"):
+            if statement.strip():
+                self._conn.execute(statement)
+        if self._conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sales_facts_v1'").fetchone():
+            self._conn.execute("INSERT OR IGNORE INTO campaigns (campaign_id, name, start_date, end_date, pre_weeks, post_weeks) "
+                               "VALUES (1, ?, ?, ?, ?, ?)", SEED_CAMPAIGN)
+            self._conn.execute("INSERT OR IGNORE INTO sales_facts (campaign_id, product_id, period, units, sales, "
+                               "campaign_vs_units, campaign_vs_sales) "
+                               "SELECT 1, product_id, period, units, sales, campaign_vs_units, campaign_vs_sales FROM sales_facts_v1")
+            self._conn.execute("DROP TABLE sales_facts_v1")
+
+    def _load_seed(self):
+        self.add_products(SEED_PRODUCTS)
+        for period, columns in SEED_SHARE_FACTS.items():
+            self.add_facts("share_facts", period, columns)
+        campaign_id = self.add_campaign(*SEED_CAMPAIGN, build=False)
+        for period, columns in SEED_SALES_FACTS.items():
+            self.add_facts("sales_facts", period, columns, campaign_id=campaign_id)
+        for dimension, buckets in SEED_DEMOGRAPHIC_FACTS.items():
+            self.add_demographics(dimension, buckets)
+
+    @contextmanager
+    def _write(self):
+        # One transaction; a write made inside another (the rollups rebuilt by
+        # add_weekly_sales) joins it, and cached query results are dropped once
+        # the outermost one commits
+        with self._lock:
+            outermost = self._depth == 0
+            self._depth += 1
+            try:
+                if outermost:
+                    with self._conn:
+                        self._conn.execute("BEGIN")
+                        yield
+                else:
+                    yield
+            finally:
+                self._depth -= 1
+        if outermost:
+            self._shared.discard(lambda k: k[:2] == ('store', self.path))
+
+    def _product_ids(self, products):
+        ids = dict(self._conn.execute("SELECT description, product_id FROM products"))
+        return [ids[p] for p in products]
+
+    def add_products(self, products):
+        with self._write():
+            self._conn.executemany("INSERT OR IGNORE INTO products (description) VALUES (?)", [(p,) for p in products])
+
+    def add_facts(self, table, period, columns, products=SEED_PRODUCTS, campaign_id=None):
+        # columns: {fact column: values aligned with products}; sales_facts rows need a campaign_id
+        if campaign_id is not None:
+            columns = {"campaign_id": [campaign_id] * len(products), **columns}
+        names = list(columns)
+        with self._write():
+            rows = [(pid, period, *values) for pid, *values in zip(self._product_ids(products), *columns.values())]
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {table} (product_id, period, {', '.join(names)}) "
+                f"VALUES (?, ?{', ?' * len(names)})", rows)
+
+    def add_demographics(self, dimension, buckets, products=SEED_PRODUCTS):
+        with self._write():
+            ids = self._product_ids(products)
+            rows = [(pid, dimension, bucket, order, share)
+                    for order, (bucket, shares) in enumerate(buckets.items())
+                    for pid, share in zip(ids, shares)]
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO demographic_facts (product_id, dimension, bucket, bucket_order, share) "
+                "VALUES (?, ?, ?, ?, ?)", rows)
+
+    def add_weekly_sales(self, rows):
+        # rows: (product description, week_start 'YYYY-MM-DD', units, sales); rebuilds affected campaign rollups
+        rows = list(rows)
+        if not rows:
+            return
+        with self._write():
+            ids = dict(zip({r[0] for r in rows}, self._product_ids({r[0] for r in rows})))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO weekly_sales (product_id, week_start, units, sales) VALUES (?, ?, ?, ?)",
+                [(ids[product], week, units, sales) for product, week, units, sales in rows])
+            first, last = min(r[1] for r in rows), max(r[1] for r in rows)
+            affected = self._conn.execute("""
+                SELECT campaign_id FROM campaigns
+                WHERE date(start_date, '-' || (7 * pre_weeks) || ' days') <= ?
+                  AND date(end_date, '+' || (7 * post_weeks) || ' days') >= ?
+            """, (last, first)).fetchall()
+            for (campaign_id,) in affected:
+                self.build_rollup(campaign_id)
+
+    def add_campaign(self, name, start_date, end_date, pre_weeks=6, post_weeks=6, build=True):
+        with self._write():
+            campaign_id = self._conn.execute(
+                "INSERT INTO campaigns (name, start_date, end_date, pre_weeks, post_weeks) VALUES (?, ?, ?, ?, ?)",
+                (name, start_date, end_date, pre_weeks, post_weeks)).lastrowid
+            if build:
+                self.build_rollup(campaign_id)
+        return campaign_id
+
+    def build_rollup(self, campaign_id):
+        # Weekly averages per period from the raw weekly facts, then the % changes
+        with self._write():
+            self._conn.execute("DELETE FROM sales_facts WHERE campaign_id = ?", (campaign_id,))
+            self._conn.execute(f"""
+                INSERT INTO sales_facts (campaign_id, product_id, period, units, sales)
+                SELECT p.campaign_id, w.product_id, p.period,
+                       SUM(w.units) * 1.0 / p.weeks, SUM(w.sales) * 1.0 / p.weeks
+                FROM ({PERIOD_WINDOWS}) p
+                JOIN weekly_sales w ON w.week_start BETWEEN p.lo AND p.hi
+                WHERE p.campaign_id = ?
+                GROUP BY w.product_id, p.period
+            """, (campaign_id,))
+            for measure in ("units", "sales"):
+                self._conn.execute(f"""
+                    UPDATE sales_facts SET campaign_vs_{measure} = (
+                        SELECT cur.{measure} * 1.0 / NULLIF(sales_facts.{measure}, 0) - 1
+                        FROM sales_facts cur
+                        WHERE cur.campaign_id = sales_facts.campaign_id AND cur.product_id = sales_facts.product_id
+                          AND cur.period = 'campaign')
+                    WHERE campaign_id = ? AND period = 'pre'
+                """, (campaign_id,))
+                self._conn.execute(f"""
+                    UPDATE sales_facts SET campaign_vs_{measure} = (
+                        SELECT sales_facts.{measure} * 1.0 / NULLIF(cur.{measure}, 0) - 1
+                        FROM sales_facts cur
+                        WHERE cur.campaign_id = sales_facts.campaign_id AND cur.product_id = sales_facts.product_id
+                          AND cur.period = 'campaign')
+                    WHERE campaign_id = ? AND period = 'post'
+                """, (campaign_id,))
+
+    def campaigns(self):
+        # Most recent first
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {', '.join(Campaign._fields)} FROM campaigns "
+                                      "ORDER BY start_date DESC, campaign_id DESC").fetchall()
+        return [Campaign(*row) for row in rows]
+
+    def rolled_up_campaigns(self):
+        # Campaigns with rollup rows: a campaign added before any weekly sales in its windows has none
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT DISTINCT campaign_id FROM sales_facts")}
+
+    def query(self, sql, params=()):
+        # Results live in the shared cache until the store changes (data_version
+        # moves when another connection commits); callers must not modify them
+        import pandas as pd
+
+        from dashboard.frames import compact_frame
+
+        with self._lock:
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            key = ('store', self.path, version, sql, tuple(params))
+            found, df = self._shared.lookup(key)
+            if found:
+                return df
+            with span('read'):
+                df = pd.read_sql_query(sql, self._conn, params=params)
+            df = compact_frame(df)
+            self._shared.discard(lambda k: k[:2] == key[:2] and k[2] != version)
+            return self._shared.put(key, df)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def category_shares(self):
+        return self.query("""
+            SELECT p.description AS "Product Description",
+                   cur.pepsico_share AS "PepsiCo Campaign Category Share",
+                   cur.competitor_share AS "Competitor Category Share",
+                   pre.pepsico_share AS "Pre-Campaign PepsiCo",
+                   pre.share_change AS "% Change"
+            FROM share_facts cur
+            JOIN products p ON p.product_id = cur.product_id
+            LEFT JOIN share_facts pre ON pre.product_id = cur.product_id AND pre.period = 'pre_campaign'
+            WHERE cur.period = 'campaign'
+            ORDER BY cur.product_id
+        """)
+
+    def campaign_periods(self, measure, campaign_id):
+        # measure: 'units' or 'sales'; reads the campaign's precomputed rollup
+        if measure not in ("units", "sales"):
+            raise ValueError(f"Unknown measure: {measure}")
+        return self.query(f"""
+            SELECT p.description AS "Product Description",
+                   pre.{measure} AS pre,
+                   cur.{measure} AS campaign,
+                   post.{measure} AS post,
+                   pre.campaign_vs_{measure} AS "% Change (Campaign vs Pre)",
+                   post.campaign_vs_{measure} AS "% Change (Campaign vs Post)"
+            FROM sales_facts cur
+            JOIN products p ON p.product_id = cur.product_id
+            LEFT JOIN sales_facts pre
+                ON pre.campaign_id = cur.campaign_id AND pre.period = 'pre' AND pre.product_id = cur.product_id
+            LEFT JOIN sales_facts post
+                ON post.campaign_id = cur.campaign_id AND post.period = 'post' AND post.product_id = cur.product_id
+            WHERE cur.campaign_id = ? AND cur.period = 'campaign'
+            ORDER BY cur.product_id
+        """, (campaign_id,))
+
+    def weekly_periods(self, measure, campaign_id):
+        # The raw weekly facts behind campaign_periods, one row per product, period
+        # and week with sales; weeks is the period's length in weeks
+        if measure not in ("units", "sales"):
+            raise ValueError(f"Unknown measure: {measure}")
+        return self.query(f"""
+            SELECT p.description AS "Product Description", per.period, per.weeks, w.week_start, w.{measure} AS value
+            FROM ({PERIOD_WINDOWS}) per
+            JOIN weekly_sales w ON w.week_start BETWEEN per.lo AND per.hi
+            JOIN products p ON p.product_id = w.product_id
+            WHERE per.campaign_id = ?
+            ORDER BY w.product_id, w.week_start
+        """, (campaign_id,))
+
+    def demographic_split(self, dimension, rollup=None):
+        # Average per-product share for each bucket; rollup merges buckets, e.g. {'0-18': '0-24'}
+        rollup = rollup or {}
+        case = " ".join("WHEN ? THEN ?" for _ in rollup)
+        bucket = f"CASE bucket {case} ELSE bucket END" if rollup else "bucket"
+        params = [v for pair in rollup.items() for v in pair]
+        df = self.query(f"""
+            SELECT {bucket} AS bucket,
+                   SUM(share) * 1.0 / COUNT(DISTINCT product_id) AS share
+            FROM demographic_facts
+            WHERE dimension = ?
+            GROUP BY 1
+            ORDER BY MIN(bucket_order)
+        """, (*params, dimension))
+        return df.set_index('bucket')['share']
+
+# Age buckets the Demographics page reports as one
+AGE_ROLLUP = {"0-18": "0-24", "18-24": "0-24"}
+
+@st.cache_resource
+def _open_data_store(path):
+    return DataStore(path, shared=get_shared_cache())
+
+def get_data_store():
+    # One store per database file, resolved against the working directory
+    return _open_data_store(os.path.abspath(DATA_STORE_PATH))
+
+def default_campaign_id(store):
+    # The most recent campaign with rollup rows, else the most recent campaign
+    campaigns, rolled_up = store.campaigns(), store.rolled_up_campaigns()
+    fallback = campaigns[0].campaign_id if campaigns else None
+    return next((c.campaign_id for c in campaigns if c.campaign_id in rolled_up), fallback)
+
+def selected_campaign_id():
+    # Set by the sidebar campaign selector; defaults to default_campaign_id
+    campaign_id = st.session_state.get("campaign_id")
+    if campaign_id is None:
+        campaign_id = default_campaign_id(get_data_store())
+    return campaign_id
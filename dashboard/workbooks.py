@@ -0,0 +1,333 @@
+import json
+import os
+import threading
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+from dashboard.cache import SharedCache, get_shared_cache
+from dashboard.diagnostics import record_cache, span
+from dashboard.frames import compact_frame
+from dashboard.metrics import Kpi, frame_kpis
+from dashboard.schemas import Field, Schema, cast_columns, read_columns
+
+# ---------------- Workbook Cache ----------------
+class WorkbookCache:
+    # Cleaned workbook data, keyed on (path, loader, mtime, size) so an edited
+    # workbook is re-read on the next rerun and stale entries dropped. Entries
+    # live in the shared cache under its byte budget. A key being loaded
+    # (e.g. by the session prefetch) is waited on, not re-read.
+    def __init__(self, shared=None):
+        self._shared = shared if shared is not None else SharedCache()
+        self._loading = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key):
+        found, value = self._shared.lookup(('workbook', *key))
+        with self._lock:
+            if found:
+                self.hits += 1
+                record_cache(hit=True)
+                return True, value
+            return False, self._loading.setdefault(key, threading.Lock())
+
+    def get(self, path, loader):
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        return self.load((path, loader.__name__, stat.st_mtime_ns, stat.st_size), lambda: loader(path))
+
+    def load(self, key, build):
+        # key is (source, name, *version); an entry for another version of the
+        # same (source, name) is dropped once the new one is built
+        found, value = self._lookup(key)
+        if found:
+            return value
+        with value:
+            found, value = self._lookup(key)
+            if found:
+                return value
+            record_cache(hit=False)
+            try:
+                value = build()
+            except BaseException:
+                with self._lock:
+                    self._loading.pop(key, None)
+                raise
+            self._shared.discard(lambda k: k[0] == 'workbook' and k[1:3] == key[:2])
+            self._shared.put(('workbook', *key), value)
+            with self._lock:
+                self._loading.pop(key, None)
+                self.misses += 1
+        return value
+
+    @property
+    def shared(self):
+        return self._shared
+
+    def stats(self):
+        with self._lock:
+            entries = sum(1 for k in self._shared.keys() if k[0] == 'workbook')
+            return {'hits': self.hits, 'misses': self.misses, 'entries': entries}
+
+    def clear(self):
+        self._shared.discard(lambda k: k[0] == 'workbook')
+
+@st.cache_resource
+def get_workbook_cache():
+    return WorkbookCache(get_shared_cache())
+
+# ---------------- Columnar Sidecars ----------------
+# Parsing .xlsx through openpyxl dominates load time, so each cleaned workbook
+# is also written next to the source as Parquet and read back memory-mapped.
+# The sidecar records the (mtime, size) of the workbook it was built from in
+# its schema metadata and is served only while the workbook still has exactly
+# that stamp, so a restored or copied workbook with an older mtime is re-read.
+SIDECAR_STAMP = b'dashboard.source_stamp'
+
+def sidecar_path(path):
+    return os.path.splitext(path)[0] + '.parquet'
+
+def file_stamp(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+def sidecar_stamp(sidecar):
+    import pyarrow.parquet as pq
+
+    value = (pq.read_schema(sidecar).metadata or {}).get(SIDECAR_STAMP)
+    return tuple(json.loads(value)) if value else None
+
+def sidecar_is_fresh(path, stamp=None):
+    try:
+        return sidecar_stamp(sidecar_path(path)) == (stamp or file_stamp(path))
+    except Exception:
+        # Missing, unreadable or pre-stamp sidecar, or no pyarrow
+        return False
+
+def _stamped_table(df, stamp, schema=None):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+    return table.replace_schema_metadata({**(table.schema.metadata or {}), SIDECAR_STAMP: json.dumps(stamp)})
+
+def _sidecar_tmp(sidecar):
+    return f'{sidecar}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+def write_sidecar(df, sidecar, stamp):
+    import pyarrow.parquet as pq
+
+    tmp = _sidecar_tmp(sidecar)
+    try:
+        pq.write_table(_stamped_table(df, stamp), tmp)
+        os.replace(tmp, sidecar)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def stream_sidecar(chunks, sidecar, stamp):
+    # Passes cleaned chunks through while appending each to a new sidecar,
+    # which replaces the old one only once the last chunk is written
+    writer, failed, tmp = None, False, _sidecar_tmp(sidecar)
+    try:
+        for chunk in chunks:
+            if not failed:
+                try:
+                    if writer is None:
+                        import pyarrow.parquet as pq
+
+                        table = _stamped_table(chunk, stamp)
+                        writer = pq.ParquetWriter(tmp, table.schema)
+                    else:
+                        table = _stamped_table(chunk, stamp, writer.schema)
+                    writer.write_table(table)
+                except Exception:
+                    # pyarrow missing, read-only directory or a chunk that does not fit: no sidecar
+                    failed = True
+            yield chunk
+        if writer is not None and not failed:
+            writer.close()
+            writer = None
+            os.replace(tmp, sidecar)
+    finally:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def load_columnar(path, reader):
+    sidecar = sidecar_path(path)
+    # Taken before the read: a workbook edited mid-read leaves a sidecar that no longer matches
+    stamp = file_stamp(path)
+    try:
+        if sidecar_is_fresh(path, stamp):
+            with span('read'):
+                return pd.read_parquet(sidecar, memory_map=True)
+    except Exception:
+        # Unreadable or partially written sidecar: rebuild it from the workbook
+        pass
+    df = reader(path)
+    try:
+        write_sidecar(df, sidecar, stamp)
+    except Exception:
+        # pyarrow missing or read-only directory: keep serving from the workbook
+        pass
+    return df
+
+def write_columnar(path, reader):
+    # load_columnar for its sidecar alone, e.g. in a worker process: nothing to send back
+    load_columnar(path, reader)
+
+# ---------------- Workbook Loaders ----------------
+# Headers are matched against these schemas (see dashboard.schemas) before any
+# data is read. YOY columns are renamed to the field names; Prior Periods
+# columns keep their dated headers and are looked up through the layout.
+KEY = 'Product Description'
+KEY_ALIASES = (r'^product description', r'^product\b', r'^description', r'^item\b', r'^sku\b')
+
+YOY_SCHEMA = Schema('YOY Analysis', [
+    Field(KEY, KEY_ALIASES, object, True),
+    Field('QTY Sold Prior Year', (r'^qty sold prior year', r'^(qty|units|quantity)\b.*\bprior year', r'^prior year'), 'float64', True),
+    Field('QTY Sold CAMPAIGN PERIOD', (r'^qty sold \(?campaign', r'^(qty|units|quantity)\b.*\bcampaign', r'^campaign'), 'float64', True),
+    Field('Increase in sales from Prior Year AVE', (r'^increase', r'^(yoy )?(change|growth)\b'), 'float64', True),
+])
+YOY_COLUMNS = [f.name for f in YOY_SCHEMA.fields]
+
+# Claim order puts 'increase' ahead of the period columns, whose aliases its header could match
+PRIOR_PERIODS_SCHEMA = Schema('Prior Periods', [
+    Field(KEY, KEY_ALIASES, object, True),
+    Field('increase', (r'^increase', r'^(change|growth)\b'), 'float64', False),
+    Field('prior year', (r'prior year',), 'float64', False),
+    Field('prior months', (r'\bfeb\b', r'^(qty sold |units )?prior months'), 'float64', False),
+    Field('campaign', (r'campaign',), 'float64', False),
+])
+PRIOR_PERIODS_ROLES = ('prior year', 'prior months', 'campaign', 'increase')
+
+def read_yoy_excel(path):
+    df, layout = read_columns(path, YOY_SCHEMA)
+    with span('clean'):
+        df = df[layout.columns(YOY_COLUMNS)].set_axis(YOY_COLUMNS, axis=1)
+        return df[df[KEY].apply(lambda x: isinstance(x, str))]
+
+def detect_prior_periods_columns(columns):
+    # (prior year, prior months, campaign, increase) headers, None where absent
+    layout = PRIOR_PERIODS_SCHEMA.resolve(columns)
+    return tuple(layout.columns(PRIOR_PERIODS_ROLES))
+
+def read_prior_periods_excel(path):
+    df, layout = read_columns(path, PRIOR_PERIODS_SCHEMA)
+    col_prior, col_feb_may = layout.columns(('prior year', 'prior months'))
+
+    with span('clean'):
+        df = df.rename(columns={layout.column(KEY): KEY})
+        df = df[df[KEY].apply(lambda x: isinstance(x, str))].copy()
+        # Compute avg prior months if possible
+        if col_prior and col_feb_may:
+            df['Avg Prior Months'] = df[[col_prior, col_feb_may]].mean(axis=1)
+        else:
+            df['Avg Prior Months'] = np.nan
+    return df
+
+def load_yoy_workbook(path):
+    return compact_frame(load_columnar(path, read_yoy_excel))
+
+# ---------------- Streaming YOY Ingestion ----------------
+# Store-by-SKU extracts can run to millions of rows, so Key Findings are
+# computed from fixed-size chunks instead of materializing the whole sheet.
+YOY_CHUNK_SIZE = 50_000
+
+def _yoy_chunk(rows, layout):
+    chunk = cast_columns(pd.DataFrame(rows, columns=layout.columns(YOY_COLUMNS)), layout).set_axis(YOY_COLUMNS, axis=1)
+    return chunk[chunk[KEY].apply(lambda x: isinstance(x, str))]
+
+def iter_yoy_excel_chunks(path, chunk_size=YOY_CHUNK_SIZE):
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(min_row=YOY_SCHEMA.header_row + 1, values_only=True)
+        header = [str(c).strip() if c is not None else '' for c in next(rows, ())]
+        layout = YOY_SCHEMA.resolve(header, source=os.path.basename(path))
+        positions = [layout.positions[c] for c in YOY_COLUMNS]
+        buf = []
+        for row in rows:
+            buf.append([row[i] if i < len(row) else None for i in positions])
+            if len(buf) >= chunk_size:
+                yield _yoy_chunk(buf, layout)
+                buf = []
+        if buf:
+            yield _yoy_chunk(buf, layout)
+    finally:
+        wb.close()
+
+def iter_yoy_chunks(path, chunk_size=YOY_CHUNK_SIZE):
+    # Prefer the already-cleaned sidecar; its row batches are read memory-mapped.
+    # Otherwise the workbook is parsed once, in chunks, and the sidecar written
+    # from the same chunks, so the table load that follows reads the sidecar.
+    stamp = file_stamp(path)
+    if sidecar_is_fresh(path, stamp):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(sidecar_path(path), memory_map=True).iter_batches(batch_size=chunk_size, columns=YOY_COLUMNS):
+            yield batch.to_pandas()
+    else:
+        yield from stream_sidecar(iter_yoy_excel_chunks(path, chunk_size), sidecar_path(path), stamp)
+
+class YoyAggregates:
+    # Running Key Findings statistics; update() merges one chunk's KPIs
+    def __init__(self):
+        self.rows = 0
+        self.kpis = None
+
+    def update(self, chunk):
+        if not len(chunk):
+            return
+        kpis = frame_kpis(chunk, YOY_COLUMNS[1:])
+        self.rows += len(chunk)
+        self.kpis = kpis if self.kpis is None else {c: self.kpis[c].merge(kpis[c]) for c in kpis}
+
+    def _kpi(self, column):
+        return self.kpis[column] if self.kpis else Kpi(0, 0, 0, 0.0, None, np.nan, None, np.nan)
+
+    @property
+    def increase_count(self):
+        return self._kpi('Increase in sales from Prior Year AVE').positive
+
+    @property
+    def decrease_count(self):
+        return self._kpi('Increase in sales from Prior Year AVE').negative
+
+    @property
+    def avg_increase(self):
+        return self._kpi('Increase in sales from Prior Year AVE').mean
+
+    @property
+    def top_grower(self):
+        kpi = self._kpi('Increase in sales from Prior Year AVE')
+        return (kpi.top_label, kpi.top_value) if kpi.top_label is not None else None
+
+    @property
+    def top_decliner(self):
+        kpi = self._kpi('Increase in sales from Prior Year AVE')
+        return (kpi.bottom_label, kpi.bottom_value) if kpi.bottom_label is not None else None
+
+    @property
+    def total_prior(self):
+        return self._kpi('QTY Sold Prior Year').total
+
+    @property
+    def total_campaign(self):
+        return self._kpi('QTY Sold CAMPAIGN PERIOD').total
+
+    @property
+    def total_growth(self):
+        return (self.total_campaign - self.total_prior) / self.total_prior if self.total_prior != 0 else np.nan
+
+def summarize_yoy_workbook(path, chunk_size=YOY_CHUNK_SIZE):
+    summary = YoyAggregates()
+    # Chunk reads are charged to 'read'; the KPI kernel records its own 'compute'
+    with span('read'):
+        for chunk in iter_yoy_chunks(path, chunk_size):
+            summary.update(chunk)
+    return summary
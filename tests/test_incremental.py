@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.cache import SharedCache
+from dashboard.incremental import KEY, PriorPeriodsPipeline, cached_pipeline, prior_periods_metrics
+from dashboard.metrics import compute_kpis
+
+PRIOR_YEAR = 'QTY Sold Prior Year'
+FEB_MAY = 'QTY Sold 14 Feb to 13 May 2025'
+CAMPAIGN = 'QTY Sold (CAMPAIGN PERIOD)'
+INCREASE = 'Increase in sales from Avg of prior months'
+METRIC_COLUMNS = [PRIOR_YEAR, FEB_MAY, CAMPAIGN, INCREASE]
+
+def _row(rng, key):
+    # Small integers, so ties between products (and with extrema) are common
+    values = rng.integers(0, 8, 3).astype(float)
+    increase = rng.integers(-3, 4) / 2 if rng.random() > 0.1 else np.nan
+    return {KEY: key, PRIOR_YEAR: values[0], FEB_MAY: values[1], CAMPAIGN: values[2], INCREASE: increase}
+
+def _table(rows):
+    df = pd.DataFrame(rows, columns=[KEY, *METRIC_COLUMNS])
+    df['Avg Prior Months'] = df[[PRIOR_YEAR, FEB_MAY]].mean(axis=1)
+    return df
+
+def _edit(rng, rows, next_key):
+    for _ in range(rng.integers(1, 4)):
+        action = rng.choice(['insert', 'update', 'delete', 'tie', 'swap'])
+        if action == 'insert' or len(rows) < 3:
+            rows.insert(rng.integers(0, len(rows) + 1), _row(rng, f'P{next_key:05d}'))
+            next_key += 1
+        elif action == 'update':
+            i = rng.integers(len(rows))
+            rows[i] = _row(rng, rows[i][KEY])
+        elif action == 'delete':
+            rows.pop(rng.integers(len(rows)))
+        elif action == 'swap':
+            # Reorder only: tied extrema now resolve to whichever row comes first
+            i, j = rng.integers(len(rows), size=2)
+            rows[i], rows[j] = rows[j], rows[i]
+        else:
+            # Copy another row's values, tying whatever extrema it holds
+            i, j = rng.integers(len(rows), size=2)
+            rows[i] = {**rows[j], KEY: rows[i][KEY]}
+    return next_key
+
+def _full_kpis(pipeline):
+    metrics = prior_periods_metrics(pipeline.table, pipeline.cols)
+    return compute_kpis(metrics.to_numpy(), pipeline.table[KEY].to_numpy(), list(metrics.columns))
+
+@pytest.mark.parametrize('seed', range(4))
+def test_incremental_kpis_match_full_recompute(seed):
+    rng = np.random.default_rng(seed)
+    rows = [_row(rng, f'P{i:05d}') for i in range(40)]
+    version, next_key = [0], 40
+    pipeline = PriorPeriodsPipeline('test', load=lambda: _table(rows), stamp=lambda: version[0])
+    pipeline.refresh()
+    for _ in range(100):
+        next_key = _edit(rng, rows, next_key)
+        version[0] += 1
+        pipeline.refresh()
+        assert not pipeline.last_changes['rebuilt']
+        expected = _full_kpis(pipeline)
+        assert pipeline.kpis.keys() == expected.keys()
+        for name, kpi in pipeline.kpis.items():
+            want = expected[name]
+            assert kpi[:3] == want[:3]
+            assert kpi.total == pytest.approx(want.total)
+            assert (kpi.top_label, kpi.bottom_label) == (want.top_label, want.bottom_label)
+            np.testing.assert_equal([kpi.top_value, kpi.bottom_value], [want.top_value, want.bottom_value])
+
+def test_reordered_tie_moves_the_extremum():
+    rows = [{KEY: 'A', PRIOR_YEAR: 1.0, FEB_MAY: 1.0, CAMPAIGN: 5.0, INCREASE: 2.0},
+            {KEY: 'B', PRIOR_YEAR: 1.0, FEB_MAY: 1.0, CAMPAIGN: 5.0, INCREASE: 2.0},
+            {KEY: 'C', PRIOR_YEAR: 1.0, FEB_MAY: 1.0, CAMPAIGN: 0.0, INCREASE: -1.0}]
+    version = [0]
+    pipeline = PriorPeriodsPipeline('test', load=lambda: _table(rows), stamp=lambda: version[0])
+    pipeline.refresh()
+    assert pipeline.kpis['increase'].top_label == 'A'
+    rows[0], rows[1] = rows[1], rows[0]
+    version[0] += 1
+    pipeline.refresh()
+    assert pipeline.last_changes == {'inserted': 0, 'updated': 0, 'deleted': 0, 'rebuilt': False}
+    assert pipeline.kpis['increase'].top_label == pipeline.kpis['vs_avg'].top_label == 'B'
+
+def test_unchanged_stamp_skips_reload():
+    rng = np.random.default_rng(0)
+    rows = [_row(rng, f'P{i:05d}') for i in range(5)]
+    loads = []
+    pipeline = PriorPeriodsPipeline('test', load=lambda: loads.append(1) or _table(rows), stamp=lambda: 0)
+    pipeline.refresh()
+    pipeline.refresh()
+    assert len(loads) == 1
+
+def test_pipelines_count_against_the_shared_budget():
+    rng = np.random.default_rng(0)
+    rows = [_row(rng, f'P{i:05d}') for i in range(200)]
+    shared = SharedCache(budget=10 ** 9)
+    first = cached_pipeline(shared, ('pipeline', 1), 'test', load=lambda: _table(rows), stamp=lambda: 0)
+    first.refresh()
+    assert shared.stats()['resident_bytes'] == first.nbytes > 0
+    assert cached_pipeline(shared, ('pipeline', 1), 'test') is first
+    # Room for one loaded pipeline: loading a second evicts the first
+    shared.budget = first.nbytes * 3 // 2
+    second = cached_pipeline(shared, ('pipeline', 2), 'test', load=lambda: _table(rows), stamp=lambda: 0)
+    second.refresh()
+    assert shared.keys() == [('pipeline', 2)]
+    assert shared.stats()['resident_bytes'] == second.nbytes <= shared.budget
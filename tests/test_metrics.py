@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+
+from dashboard.metrics import Kpi, compute_kpis, frame_kpis
+
+def test_empty_rows_give_empty_kpis():
+    kpis = compute_kpis(np.empty((0, 2)), np.empty(0, dtype=object), ['a', 'b'])
+    for kpi in kpis.values():
+        assert kpi[:4] == (0, 0, 0, 0.0)
+        assert kpi.top_label is None and kpi.bottom_label is None
+        assert np.isnan(kpi.top_value) and np.isnan(kpi.bottom_value)
+        assert np.isnan(kpi.mean)
+
+def test_empty_frame():
+    df = pd.DataFrame({'Product Description': pd.Series([], dtype=object), 'x': pd.Series([], dtype=float)})
+    assert frame_kpis(df, ['x'])['x'].count == 0
+
+def test_empty_kpi_merges_as_identity():
+    empty = compute_kpis(np.empty((0, 1)), np.empty(0, dtype=object), ['x'])['x']
+    block = compute_kpis(np.array([[2.0], [-1.0], [np.nan]]), np.array(['p', 'q', 'r'], dtype=object), ['x'])['x']
+    assert block == Kpi(1, 1, 2, 1.0, 'p', 2.0, 'q', -1.0)
+    assert empty.merge(block) == block
+    assert block.merge(empty) == block
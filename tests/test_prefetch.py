@@ -0,0 +1,17 @@
+import threading
+
+from dashboard.prefetch import Prefetcher
+
+def test_submit_dedupes_on_name_and_args():
+    release = threading.Event()
+    prefetcher = Prefetcher(workers=2)
+    first = prefetcher.submit('Units', release.wait, 1)
+    assert prefetcher.submit('Units', release.wait, 1) is first
+    # Another campaign while the first is still in flight is its own task
+    other = prefetcher.submit('Units', release.wait, 2)
+    assert other is not first
+    assert prefetcher.status() == {'Units': 'loading'}
+    release.set()
+    first.result(), other.result()
+    assert prefetcher.status() == {'Units': 'ready'}
+    assert prefetcher.submit('Units', release.wait, 1) is not first
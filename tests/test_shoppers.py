@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+
+from dashboard.shoppers import summarize_transactions
+
+def test_days_follow_the_written_wall_clock(tmp_path):
+    # 01:00 at +02:00 on 19 May 2025 is a local Monday but still Sunday in UTC
+    path = tmp_path / 'Shopper Transactions.csv'
+    path.write_text('timestamp,gender,age,quantity\n'
+                    '2025-05-19T01:00+02:00,F,30,2\n'
+                    '2025-05-18 12:00:00.5Z,M,40,\n'
+                    ',F,20,1\n')
+    splits = summarize_transactions(str(path))
+    # The record without a timestamp has no day
+    assert splits.day[['Mon', 'Sun']].tolist() == pytest.approx([2 / 3, 1 / 3])
+    # A blank quantity counts as one unit rather than dropping the record
+    assert splits.volume == 4
+    assert splits.gender.tolist() == [0.75, 0.25]
+
+def test_zoned_parquet_timestamps_use_local_days(tmp_path):
+    stamps = pd.to_datetime(['2025-05-18T23:00Z', '2025-05-18T12:00Z'], utc=True).tz_convert('Europe/Berlin')
+    path = tmp_path / 'Shopper Transactions.parquet'
+    pd.DataFrame({'timestamp': stamps, 'gender': ['F', 'M'], 'age': [30.0, 40.0]}).to_parquet(path)
+    splits = summarize_transactions(str(path))
+    assert splits.day[['Mon', 'Sun']].tolist() == [0.5, 0.5]
+
+def test_malformed_timestamps_are_left_out_of_the_day_split(tmp_path):
+    path = tmp_path / 'Shopper Transactions.csv'
+    path.write_text('timestamp,gender,age\n'
+                    '2025-05-19 10:00,F,30\n'
+                    'not a date,M,40\n'
+                    '2025-13-45,M,50\n')
+    splits = summarize_transactions(str(path))
+    assert splits.day['Mon'] == 1
+    assert splits.records == 3
+    assert splits.gender.tolist() == pytest.approx([1 / 3, 2 / 3])
@@ -0,0 +1,62 @@
+import sqlite3
+
+import pytest
+
+from dashboard.store import SEED_PRODUCTS, STORE_VERSION, DataStore
+
+def test_weekly_sales_and_rollups_commit_together(tmp_path):
+    store = DataStore(str(tmp_path / 'store.sqlite'))
+    store.add_campaign('June', '2025-06-01', '2025-06-30')
+    statements = []
+    store._conn.set_trace_callback(statements.append)
+    store.add_weekly_sales([(SEED_PRODUCTS[0], '2025-06-16', 5, 10.0)])
+    assert [q for q in statements if q in ('BEGIN', 'COMMIT')] == ['BEGIN', 'COMMIT']
+
+    # A rollup failing after the first leaves neither the rows nor any rollup behind
+    build, calls = store.build_rollup, []
+    def failing_build(campaign_id):
+        calls.append(campaign_id)
+        if len(calls) == 2:
+            raise RuntimeError('rollup failed')
+        build(campaign_id)
+    store.build_rollup = failing_build
+    before = store._conn.execute("SELECT SUM(units) FROM sales_facts").fetchone()
+    with pytest.raises(RuntimeError):
+        store.add_weekly_sales([(SEED_PRODUCTS[0], '2025-06-23', 7, 10.0)])
+    assert store._conn.execute("SELECT COUNT(*) FROM weekly_sales WHERE week_start = '2025-06-23'").fetchone() == (0,)
+    assert store._conn.execute("SELECT SUM(units) FROM sales_facts").fetchone() == before
+
+def _v1_store(path):
+    # A version 1 store: sales facts without a campaign
+    DataStore(path).close()
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("CREATE TABLE facts_v1 AS SELECT product_id, period, units, sales, campaign_vs_units, campaign_vs_sales "
+                     "FROM sales_facts WHERE campaign_id = 1")
+        conn.execute("DROP TABLE sales_facts")
+        conn.execute("DELETE FROM campaigns")
+        conn.execute("ALTER TABLE facts_v1 RENAME TO sales_facts")
+        conn.execute("PRAGMA user_version = 1")
+    count = conn.execute("SELECT COUNT(*) FROM sales_facts").fetchone()[0]
+    conn.close()
+    return count
+
+def test_failed_migration_leaves_the_v1_store_intact(tmp_path):
+    path = str(tmp_path / 'store.sqlite')
+    facts = _v1_store(path)
+
+    class CrashingStore(DataStore):
+        def _migrate(self):
+            super()._migrate()
+            raise RuntimeError('crashed mid-migration')
+
+    with pytest.raises(RuntimeError):
+        CrashingStore(path)
+    conn = sqlite3.connect(path)
+    assert conn.execute("PRAGMA user_version").fetchone() == (1,)
+    assert conn.execute("SELECT COUNT(*) FROM sales_facts").fetchone() == (facts,)
+    conn.close()
+
+    store = DataStore(path)
+    assert store._conn.execute("SELECT COUNT(*) FROM sales_facts WHERE campaign_id = 1").fetchone() == (facts,)
+    assert store._conn.execute("PRAGMA user_version").fetchone()[0] == STORE_VERSION